@@ -223,7 +223,7 @@ class MajorityRuleSet(BaseRuleSet):
 
         # the above line ensures that there actually are towers at the given positions
         tower = towers[0]
-        share_player: int = sum(map(lambda brick: brick == player, tower.structure))
+        share_player: int = tower.structure.count(player)
         if (share_player << 1) < tower.height:  # in other words: if share < tower.height/2
             return False
 
@@ -1,5 +1,65 @@
+import random
+from functools import lru_cache
 from typing import Optional, Sequence, Dict, Tuple
 
+# random numbers that are XOR-ed together to hash game fields; keyed by position, level (counted from the bottom of a
+# tower) and the player that owns the brick at that level
+_ZOBRIST_KEYS: Dict[Tuple[Tuple[int, int], int, int], int] = {}
+
+
+def zobrist_key(pos: Tuple[int, int], level: int, brick: int) -> int:
+    """
+    Returns the random number that represents a brick of the given player at the given position and level when hashing
+    game fields. The numbers are created on first use, but only depend on the arguments, hence hashes of equal game
+    fields are equal in every process (e.g. after pickling a game field for another process).
+    :param pos: the position of the tower that contains the brick
+    :param level: the level of the brick counted from the bottom of the tower (0-indexed)
+    :param brick: the player that owns the brick
+    :return: a random 64 bit number
+    """
+    key = (pos, level, brick)
+    try:
+        return _ZOBRIST_KEYS[key]
+    except KeyError:
+        # seeding with a string is deterministic, unlike seeding with the (randomised) hash of the key
+        return _ZOBRIST_KEYS.setdefault(key, random.Random(f"{pos[0]},{pos[1]},{level},{brick}").getrandbits(64))
+
+
+def _tower_zobrist(pos: Tuple[int, int], tower: 'Tower', base_level: int = 0) -> int:
+    """
+    Computes the XOR of the random numbers of all bricks of `tower` if it was placed at `pos` on top of `base_level`
+    other bricks.
+    :param pos: the position of the tower
+    :param tower: the tower whose bricks to hash
+    :param base_level: the level of the tower's bottom brick
+    :return: the part of a game field's Zobrist hash that the tower contributes
+    """
+    zobrist = 0
+    if tower.structure is not None:
+        # the bottom brick is the last one in the structure
+        for level, brick in enumerate(reversed(tower.structure), base_level):
+            zobrist ^= zobrist_key(pos, level, brick)
+    return zobrist
+
+
+@lru_cache(maxsize=None)
+def _initial_zobrist(height: int, width: int, player1: int, player2: int) -> int:
+    """
+    Computes the Zobrist hash of a newly created game field, that is, of single bricks of both players placed in a
+    chessboard-like pattern. As it only depends on the arguments, it is computed once per combination of them.
+    :param height: number of rows of the board
+    :param width: number of columns of the board
+    :param player1: ID of first player
+    :param player2: ID of second player
+    :return: the Zobrist hash of a new game field with the given size and players
+    """
+    zobrist = 0
+    player_tuple = (player1, player2)
+    for h in range(height):
+        for w in range(width):
+            zobrist ^= zobrist_key((h, w), 0, player_tuple[(h + w) % 2])
+    return zobrist
+
 
 class Tower(object):
     """
@@ -8,6 +68,8 @@ class Tower(object):
     Each tower as an owner that is determined by the topmost brick.
     """
 
+    __slots__ = ('structure',)
+
     def __init__(self, owner: Optional[int] = None, structure: Optional[Sequence[int]] = None):
         """
         Creates a new Tower based on the owner and an optional structure (for debugging purposes mainly).
@@ -89,10 +151,11 @@ class Tower(object):
         """
         Returns a string representation that is evaluable to a `Tower` instance, that is, it satisfies
         `eval(t.__repr__())==t`
-        for any `Tower` instance `t`.
+        for any non-empty `Tower` instance `t`.
+        The owner is not part of it as it is inferable by the topmost brick.
         :return: a string representation of this tower
         """
-        return f"Tower({self.owner}, {self.structure})"
+        return f"Tower(structure={self.structure})"
 
     def __str__(self) -> str:
         """
@@ -108,9 +171,12 @@ class Move(object):
     This class stores information about one move in a game of San Jego.
     It does not contain much logic in order to keep it simple.
     In addition to the from and to positions, moves store a reference of the moved tower
-    after making the move to allow taking a move back.
+    after making the move to allow taking a move back. For the same reason, they store the heights and numbers of both
+    players' highest towers before the move (if the game field knew them).
     """
 
+    __slots__ = ('from_pos', 'to_pos', 'from_tower', 'highest_before')
+
     def __init__(self, from_pos: (int, int), to_pos: (int, int)) -> None:
         """
         Creates a new Move object by setting the source and target positions
@@ -120,6 +186,7 @@ class Move(object):
         self.from_pos = from_pos
         self.to_pos = to_pos
         self.from_tower: Optional[Tower] = None
+        self.highest_before: Optional[Tuple[int, int, int, int]] = None
 
     def already_made(self) -> bool:
         """
@@ -194,6 +261,46 @@ class GameField(object):
         player_tuple = (player1, player2)
         self.field: Dict[Tuple[int, int], Tower] = \
             {(h, w): Tower(owner=player_tuple[(h + w) % 2]) for h in range(self.height) for w in range(self.width)}
+        # heights of the highest towers of player1 and player2 followed by how many towers of that height each player
+        # has; kept up to date by make_move and take_back and computed from scratch only if it is None (which
+        # set_tower_at causes)
+        self._highest: Optional[Tuple[int, int, int, int]] = None
+        # Zobrist hash of the field; kept up to date by every method that changes it
+        self._zobrist = _initial_zobrist(height, width, player1, player2)
+
+    def _compute_zobrist(self) -> int:
+        """
+        Computes the Zobrist hash of this game field by looking at every tower on the field.
+        :return: the XOR of the random numbers of all bricks on the field
+        """
+        zobrist = 0
+        for pos, tower in self.field.items():
+            zobrist ^= _tower_zobrist(pos, tower)
+        return zobrist
+
+    def _compute_highest(self) -> Tuple[int, int, int, int]:
+        """
+        Computes the heights of both players' highest towers and how many towers of these heights they have by looking
+        at every tower on the field.
+        :return: the heights of the highest towers of player1 and player2 and their respective numbers
+        """
+        # can assume that no None and zero-height towers will be stored in this field's dict
+        highest_p1 = highest_p2 = count_p1 = count_p2 = 0
+        for tower in self.field.values():
+            structure = tower.structure
+            owner = structure[0]
+            height = len(structure)
+            if owner == self.player1:
+                if height > highest_p1:
+                    highest_p1, count_p1 = height, 1
+                elif height == highest_p1:
+                    count_p1 += 1
+            elif owner == self.player2:
+                if height > highest_p2:
+                    highest_p2, count_p2 = height, 1
+                elif height == highest_p2:
+                    count_p2 += 1
+        return highest_p1, highest_p2, count_p1, count_p2
 
     # TODO make this a method of RuleSet
     @property
@@ -203,13 +310,43 @@ class GameField(object):
         The returned value is greater than 0 if player 1 has an edge over player 2.
         :return: difference in height of both players' highest towers
         """
-        # max(height(tower of that respective player))
-        # filters can assume that no None and zero-height towers will be stored in this field's dict
-        highest_p1 = max(map(lambda tower: tower.height,
-                             filter(lambda tower: tower.owner == self.player1, self.field.values())), default=0)
-        highest_p2 = max(map(lambda tower: tower.height,
-                             filter(lambda tower: tower.owner == self.player2, self.field.values())), default=0)
-        return highest_p1 - highest_p2
+        if self._highest is None:
+            self._highest = self._compute_highest()
+        return self._highest[0] - self._highest[1]
+
+    def delta_value(self, from_pos: Tuple[int, int], to_pos: Tuple[int, int]) -> int:
+        """
+        Computes by how much the value of this game field would change if the tower at `from_pos` was moved on top of
+        the tower at `to_pos`, without actually moving it. Both positions must contain towers.
+        :param from_pos: specifies the tower to move
+        :param to_pos: specifies the tower to move on top of
+        :return: the value after the move minus the current value
+        """
+        if self._highest is None:
+            self._highest = self._compute_highest()
+        highest_p1, highest_p2, count_p1, count_p2 = self._highest
+        top_tower = self.field[from_pos]
+        lower_tower = self.field[to_pos]
+        new_owner = top_tower.owner
+        lower_owner = lower_tower.owner
+
+        # like in make_move: if the other player's only highest tower is covered, its next highest tower is searched
+        highest_lower, count_lower = (highest_p1, count_p1) if lower_owner == self.player1 else (highest_p2, count_p2)
+        if lower_owner != new_owner and lower_tower.height == highest_lower and count_lower == 1:
+            highest_remaining = max((tower.height for pos, tower in self.field.items()
+                                     if tower.owner == lower_owner and pos != to_pos), default=0)
+            if lower_owner == self.player1:
+                highest_p1 = highest_remaining
+            elif lower_owner == self.player2:
+                highest_p2 = highest_remaining
+
+        new_height = top_tower.height + lower_tower.height
+        if new_owner == self.player1:
+            highest_p1 = max(highest_p1, new_height)
+        elif new_owner == self.player2:
+            highest_p2 = max(highest_p2, new_height)
+
+        return highest_p1 - highest_p2 - self._highest[0] + self._highest[1]
 
     def __float__(self) -> float:
         """
@@ -228,10 +365,32 @@ class GameField(object):
         Compares this game field with `other` from a logical point of view. That is, two game fields are logically
         equal, if they have the same underlying `field`, `player1` and `player2` attributes.
         Note that the behavior therefore depends (partially) on the type of the underlying `field`.
+        As logically equal game fields have the same Zobrist hash, fields with different hashes are unequal without
+        comparing their towers.
         :param other: `GameField` instance to compare `self` with
         :return: whether both game fields are logically equal
         """
-        return other.field == self.field and other.player1 == self.player1 and other.player2 == self.player2
+        if not hasattr(other, "_zobrist") or other._zobrist != self._zobrist:
+            return False
+        return other.player1 == self.player1 and other.player2 == self.player2 and other.field == self.field
+
+    def zobrist_hash(self) -> int:
+        """
+        Returns a Zobrist hash of this game field, that is, the XOR of the random numbers of all bricks on the field.
+        Logically equal game fields have the same hash while different game fields collide only with a negligible
+        probability, which makes the hash suitable as a key for transposition tables.
+        The hash is updated with every change of the field (by its methods), hence this is a constant time operation.
+        :return: a 64 bit hash of the towers on this game field
+        """
+        return self._zobrist
+
+    def __hash__(self) -> int:
+        """
+        Hashes this game field consistently with `__eq__` using its Zobrist hash.
+        Note that game fields are mutable, hence they must not be changed while they are used as keys.
+        :return: the Zobrist hash of this game field
+        """
+        return self._zobrist
 
     def get_tower_at(self, pos: (int, int)) -> Optional[Tower]:
         """
@@ -259,6 +418,15 @@ class GameField(object):
         if not (0 <= pos[0] < self.height and 0 <= pos[1] < self.width):
             return False
 
+        # the highest towers can not be derived from the previous ones in general
+        self._highest = None
+
+        old_tower = self.field.get(pos)
+        if old_tower is not None:
+            self._zobrist ^= _tower_zobrist(pos, old_tower)
+        if tower is not None:
+            self._zobrist ^= _tower_zobrist(pos, tower)
+
         # this means clearing the specified position
         if tower is None:
             del self.field[pos]
@@ -309,12 +477,47 @@ class GameField(object):
         if top_tower is None or lower_tower is None:
             return False
 
-        # does the actual attaching of the top_tower at from_pos to the lower_tower at to_pos and frees the from_pos
+        highest = self._highest
+        lower_owner = lower_tower.owner
+        lower_height = lower_tower.height
+
+        # does the actual attaching of the top_tower at from_pos to the lower_tower at to_pos and frees the from_pos;
+        # the latter removes the top_tower's bricks from the hash, hence only their new levels must be added
         lower_tower.attach(top_tower)
         self.set_tower_at(from_pos, None)
+        self._zobrist ^= _tower_zobrist(to_pos, top_tower, lower_height)
 
         if move is not None:
             move.from_tower = top_tower
+            move.highest_before = highest
+
+        # update the highest towers incrementally: the moving player's highest tower can only grow, while the other
+        # player's highest tower must only be searched anew if the covered tower was the last one of that height
+        if highest is not None:
+            highest_p1, highest_p2, count_p1, count_p2 = highest
+            new_owner = top_tower.owner
+            new_height = lower_tower.height
+            covered_last_highest = False
+            if lower_owner != new_owner:
+                if lower_owner == self.player1 and lower_height == highest_p1:
+                    count_p1 -= 1
+                    covered_last_highest = count_p1 == 0
+                elif lower_owner == self.player2 and lower_height == highest_p2:
+                    count_p2 -= 1
+                    covered_last_highest = count_p2 == 0
+            # the moved tower and, if it is the mover's, the covered tower are lower than the new tower, hence they only
+            # counted if the new tower is higher than the previous highest one anyway
+            if new_owner == self.player1:
+                if new_height > highest_p1:
+                    highest_p1, count_p1 = new_height, 1
+                elif new_height == highest_p1:
+                    count_p1 += 1
+            elif new_owner == self.player2:
+                if new_height > highest_p2:
+                    highest_p2, count_p2 = new_height, 1
+                elif new_height == highest_p2:
+                    count_p2 += 1
+            self._highest = None if covered_last_highest else (highest_p1, highest_p2, count_p1, count_p2)
 
         return True
 
@@ -354,10 +557,13 @@ class GameField(object):
             raise RuntimeError("Can not take back a whole tower")
 
         tower_at_to_pos.detach(move.from_tower)
+        self._zobrist ^= _tower_zobrist(move.to_pos, move.from_tower, tower_at_to_pos.height)
         self.set_tower_at(move.from_pos, move.from_tower)
+        self._highest = move.highest_before
 
         # mark the move as reversed
         move.from_tower = None
+        move.highest_before = None
 
     @staticmethod
     def setup_field(specs: Dict[Tuple[int, int], Tower], min_height: int = 1, min_width: int = 1) -> 'GameField':
@@ -394,14 +600,9 @@ class GameField(object):
         else:
             raise ValueError("too many tower owners specified")
 
-        # set the field with values
-        for x in range(min_height):
-            for y in range(min_width):
-                pos = (x, y)
-                if pos in specs:
-                    gf.set_tower_at(pos, specs[pos])
-                else:
-                    gf.set_tower_at(pos, None)
+        # set the field with values at once; positions are kept in the row-major order of the constructor
+        gf.field = {(x, y): specs[(x, y)] for x in range(min_height) for y in range(min_width) if (x, y) in specs}
+        gf._zobrist = gf._compute_zobrist()
 
         return gf
 
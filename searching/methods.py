@@ -1,28 +1,71 @@
-from typing import List, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple, Union, Optional, Dict, Hashable
 
 from sanjego.gameobjects import Move
-from searching.util import GameNode, SearchCallback
+from searching.util import GameNode, SearchCallbackFunction
 
+# flags of transposition table entries that tell how the stored value relates to the actual value of a game state
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
 
-def alpha_beta_search(node: GameNode, depth: int, alpha: float = -float('inf'), beta: float = float('inf'),
+# bound of the search window that no game value can reach; an int keeps the comparisons on ints (game values are ints)
+INFINITY = 10 ** 9
+
+# how many captures `quiescence_search` makes in a row at most
+QUIESCENCE_DEPTH = 2
+
+# maps transposition keys of nodes to entries of (depth, value, flag, optimal moves)
+TranspositionTable = Dict[Hashable, Tuple[int, int, int, List[Move]]]
+
+
+def alpha_beta_search(node: GameNode, depth: int, alpha: int = -INFINITY, beta: int = INFINITY,
                       maximising_player: bool = True,
-                      callback: SearchCallback = None,
-                      trace_moves: bool = False) -> Union[float, Tuple[float, List[Move]]]:
+                      callback: Optional[SearchCallbackFunction] = None,
+                      trace_moves: bool = False,
+                      transposition_table: Optional[TranspositionTable] = None,
+                      quiescence: bool = False) -> Union[int, Tuple[int, List[Move]]]:
     """
     Calculates the game value from a given `node` searching at most `depth` levels utilizing alpha beta pruning.
+    If a transposition table is given, game states that were already searched deep enough (possibly reached by a
+    different order of moves) are not searched again. Otherwise, the best move found for them before is tried first.
+    Nodes must provide a `transposition_key` method and accept that move in their `children` method in that case.
     :param node: a `Node` instance
     :param depth: how many levels to search
     :param alpha:
     :param beta:
     :param maximising_player: True by default
-    :param callback: Callback class that is called at the beginning of each function call
+    :param callback: callable that is called at the beginning of each function call
     :param trace_moves: whether to return a list of the optimal moves; will be computed either way
+    :param transposition_table: dict to look up and store results of searched game states; not used if `None`
+    :param quiescence: whether to evaluate the nodes at `depth` with `quiescence_search` instead of their values;
+                       nodes must provide an `is_capture` method in that case
     :return: the value of the game until the current depth, and optionally a list of optimal moves
     """
     ###################
     # handling the callback object
     if callback is not None:
-        callback.callback(node, depth, alpha, beta, maximising_player)
+        callback(node, depth, alpha, beta, maximising_player)
+
+    ###################
+    # handling the transposition table: a stored result can be used if it was searched at least as deep as requested
+    key = None
+    first_move = None
+    if transposition_table is not None:
+        key = node.transposition_key()
+        entry = transposition_table.get(key)
+        if entry is not None:
+            _, tt_value, flag, tt_move_list = entry
+            # bounds are only used if they cause a cutoff; narrowing the window instead would make the parent
+            # mistake a bound for an exact value and lose track of the optimal moves
+            if entry[0] >= depth and (flag == EXACT or (flag == LOWER_BOUND and tt_value >= beta)
+                                      or (flag == UPPER_BOUND and tt_value <= alpha)):
+                if trace_moves:
+                    return tt_value, ([] if node.move is None else [node.move]) + tt_move_list
+                return tt_value
+            # the stored result is not sufficient, but its best move likely is the best one again
+            if tt_move_list:
+                first_move = tt_move_list[0]
 
     ###################
     # overall idea with trace_moves: every alpha_beta_search call takes the move list from its best child
@@ -30,22 +73,30 @@ def alpha_beta_search(node: GameNode, depth: int, alpha: float = -float('inf'),
 
     # recursion anchor: depth reached
     if depth == 0:
+        value = quiescence_search(node, alpha, beta, maximising_player) if quiescence else node.value()
         if trace_moves:
-            return node.value(), [node.move]  # only this search function call can be considered
-        return node.value()
+            return value, [node.move]  # only this search function call can be considered
+        return value
 
     num_children = 0
+    # the window the children are searched with; needed to tell whether the result is exact or only a bound
+    alpha_orig = alpha
+    beta_orig = beta
+    child_depth = depth - 1
+    children = node.children() if first_move is None else node.children(first_move)
 
     ###################
     if maximising_player:
-        value = -float('inf')
+        value = -INFINITY
         best_move_list = []
 
-        for child in node.children():
+        for child in children:
             num_children += 1
             child.make_move()  # make move (just making this call more visible)
-            _value, move_list = alpha_beta_search(child, depth - 1, alpha, beta, not maximising_player, callback, True)
-            value = max(value, _value)
+            _value, move_list = alpha_beta_search(child, child_depth, alpha, beta, False, callback, True,
+                                                  transposition_table, quiescence)
+            if _value > value:  # comparing directly is cheaper than calling max
+                value = _value
             child.take_back_move()  # take back (just making this call more visible)
             if value > alpha:
                 alpha = value
@@ -54,32 +105,19 @@ def alpha_beta_search(node: GameNode, depth: int, alpha: float = -float('inf'),
             if alpha >= beta:
                 break
 
-        # node.move is None indicates that this is the root function call
-        if node.move is not None:
-            best_move_list.insert(0, node.move)
-
-        # this is a leaf node
-        if num_children == 0:
-            if trace_moves:
-                # move list consist only of *this* search function call due to the insertion above
-                return node.value(), best_move_list
-            return node.value()
-
-        if trace_moves:
-            return value, best_move_list
-        return value
-
     ###################
     # maximising_player is False
     else:
-        value = float('inf')
+        value = INFINITY
         best_move_list = []
 
-        for child in node.children():
+        for child in children:
             num_children += 1
             child.make_move()  # make move (just making this call more visible)
-            _value, move_list = alpha_beta_search(child, depth - 1, alpha, beta, not maximising_player, callback, True)
-            value = min(value, _value)
+            _value, move_list = alpha_beta_search(child, child_depth, alpha, beta, True, callback, True,
+                                                  transposition_table, quiescence)
+            if _value < value:  # comparing directly is cheaper than calling min
+                value = _value
             child.take_back_move()  # take back (just making this call more visible)
             if value < beta:
                 beta = value
@@ -88,17 +126,397 @@ def alpha_beta_search(node: GameNode, depth: int, alpha: float = -float('inf'),
             if alpha >= beta:
                 break
 
-        # node.move is None indicates that this is the root function call
-        if node.move is not None:
-            best_move_list.insert(0, node.move)
+    # this is a leaf node
+    if num_children == 0:
+        value = node.value()
 
-        # this is a leaf node
-        if num_children == 0:
-            if trace_moves:
-                # move list consist only of *this* search function call due to the insertion above
-                return node.value(), best_move_list
-            return node.value()
+    if key is not None:
+        if num_children == 0 or alpha_orig < value < beta_orig:
+            flag = EXACT
+        elif value <= alpha_orig:
+            flag = UPPER_BOUND
+        else:
+            flag = LOWER_BOUND
+        # the stored moves must not contain node.move as the same state can be reached by other moves;
+        # the value of a game's end does not depend on the depth, hence it is valid for any depth
+        transposition_table[key] = (INFINITY if num_children == 0 else depth, value, flag, list(best_move_list))
 
-        if trace_moves:
-            return value, best_move_list
+    # node.move is None indicates that this is the root function call
+    if node.move is not None:
+        best_move_list.insert(0, node.move)
+
+    if trace_moves:
+        # for leaf nodes, the move list consist only of *this* search function call due to the insertion above
+        return value, best_move_list
+    return value
+
+
+def quiescence_search(node: GameNode, alpha: int = -INFINITY, beta: int = INFINITY,
+                      maximising_player: bool = True, depth: int = QUIESCENCE_DEPTH) -> int:
+    """
+    Evaluates `node` by searching only moves that capture a tower of the opponent and change the value of the game
+    state, as the value of a game state in the middle of an exchange of captures is misleading. Each player may also
+    stop capturing, hence the value of the node itself is a lower (upper) bound for the maximising (minimising) player.
+    In San Jego, almost every move covers a tower of the opponent, so this search is only cheap because captures that
+    do not change the value are ignored and at most `depth` captures are made in a row. Without these limits, it would
+    search large parts of the remaining game at every leaf of the calling search. Even so, a search that calls this at
+    its leaves takes several times as long as one of the same depth that does not.
+    :param node: a `Node` instance that provides an `is_capture` method
+    :param alpha:
+    :param beta:
+    :param maximising_player: True by default
+    :param depth: how many captures to search in a row at most
+    :return: the value of the node after the profitable captures
+    """
+    # the player to move may stop capturing ("stand pat")
+    value = node.value()
+    if depth == 0:
         return value
+    stand_pat = value
+
+    if maximising_player:
+        if value >= beta:
+            return value
+        if value > alpha:
+            alpha = value
+
+        for child in node.children():
+            if not node.is_capture(child.move):
+                continue
+            child.make_move()  # make move (just making this call more visible)
+            # captures that do not change the value are not worth searching further
+            if child.value() == stand_pat:
+                child.take_back_move()
+                continue
+            _value = quiescence_search(child, alpha, beta, False, depth - 1)
+            child.take_back_move()  # take back (just making this call more visible)
+            if _value > value:
+                value = _value
+            if value > alpha:
+                alpha = value
+            # prune the search tree
+            if alpha >= beta:
+                break
+
+    else:
+        if value <= alpha:
+            return value
+        if value < beta:
+            beta = value
+
+        for child in node.children():
+            if not node.is_capture(child.move):
+                continue
+            child.make_move()  # make move (just making this call more visible)
+            # captures that do not change the value are not worth searching further
+            if child.value() == stand_pat:
+                child.take_back_move()
+                continue
+            _value = quiescence_search(child, alpha, beta, True, depth - 1)
+            child.take_back_move()  # take back (just making this call more visible)
+            if _value < value:
+                value = _value
+            if value < beta:
+                beta = value
+            # prune the search tree
+            if alpha >= beta:
+                break
+
+    return value
+
+
+def iterative_deepening(node: GameNode, max_depth: int, maximising_player: bool = True,
+                        callback: Optional[SearchCallbackFunction] = None,
+                        trace_moves: bool = False,
+                        transposition_table: Optional[TranspositionTable] = None) -> \
+        Union[int, Tuple[int, List[Move]]]:
+    """
+    Calculates the game value by calling `alpha_beta_search` with a transposition table for the depths 1 to
+    `max_depth`. Each search tries the best moves of the previous, shallower one first, which results in a good move
+    ordering for the final search. Although the shallower searches need time as well, this often is faster than a
+    single search with `max_depth`.
+    Nodes must provide a `transposition_key` method and accept a first move in their `children` method.
+    :param node: a `Node` instance
+    :param max_depth: how many levels to search at most
+    :param maximising_player: True by default
+    :param callback: callable that is called at the beginning of each `alpha_beta_search` call
+    :param trace_moves: whether to return a list of the optimal moves; will be computed either way
+    :param transposition_table: dict to look up and store results of searched game states; a new one if `None`
+    :return: the value of the game until `max_depth`, and optionally a list of optimal moves
+    """
+    if transposition_table is None:
+        transposition_table = {}
+
+    if max_depth < 1:
+        return alpha_beta_search(node, 0, maximising_player=maximising_player, callback=callback,
+                                 trace_moves=trace_moves, transposition_table=transposition_table)
+
+    result = None
+    for depth in range(1, max_depth + 1):
+        result = alpha_beta_search(node, depth, maximising_player=maximising_player, callback=callback,
+                                   trace_moves=trace_moves, transposition_table=transposition_table)
+    return result
+
+
+class _SearchFrame(object):
+    """
+    Holds the state of a single node during `iterative_alpha_beta_search`, i.e. what would be the local variables of an
+    `alpha_beta_search` call.
+    """
+
+    __slots__ = ('node', 'children', 'child', 'depth', 'alpha', 'beta', 'maximising_player', 'value',
+                 'best_move_list', 'num_children')
+
+    def __init__(self, node: GameNode, depth: int, alpha: int, beta: int, maximising_player: bool) -> None:
+        """
+        Creates a new frame for searching `node` before any of its children is searched. Besides the arguments, the
+        frame holds an iterator over the node's `children` that is advanced one child at a time, the `child` that is
+        currently searched (`None` before the first one), the best `value` found so far (starting at the worst one for
+        the moving player), the `best_move_list` that leads to it and the number of children searched so far
+        (`num_children`), which tells whether the node is a leaf.
+        :param node: the `Node` instance to search
+        :param depth: how many levels to search below `node`
+        :param alpha: the current lower bound of the search window; raised while searching the children
+        :param beta: the current upper bound of the search window; lowered while searching the children
+        :param maximising_player: whether the maximising player moves at `node`
+        """
+        self.node = node
+        self.children = iter(node.children())
+        self.child: Optional[GameNode] = None  # the child that is currently searched
+        self.depth = depth
+        self.alpha = alpha
+        self.beta = beta
+        self.maximising_player = maximising_player
+        self.value = -INFINITY if maximising_player else INFINITY
+        self.best_move_list: List[Move] = []
+        self.num_children = 0
+
+
+def iterative_alpha_beta_search(node: GameNode, depth: int, alpha: int = -INFINITY, beta: int = INFINITY,
+                                maximising_player: bool = True,
+                                callback: Optional[SearchCallbackFunction] = None,
+                                trace_moves: bool = False) -> Union[int, Tuple[int, List[Move]]]:
+    """
+    Calculates the same game value and optimal moves as `alpha_beta_search`, but keeps the searched path on an explicit
+    stack instead of calling itself recursively. This avoids the overhead of Python function calls and is not limited
+    by the recursion limit.
+    :param node: a `Node` instance
+    :param depth: how many levels to search
+    :param alpha:
+    :param beta:
+    :param maximising_player: True by default
+    :param callback: callable that is called once for every searched node
+    :param trace_moves: whether to return a list of the optimal moves; will be computed either way
+    :return: the value of the game until the current depth, and optionally a list of optimal moves
+    """
+    if callback is not None:
+        callback(node, depth, alpha, beta, maximising_player)
+
+    # recursion anchor: depth reached
+    if depth == 0:
+        if trace_moves:
+            return node.value(), [node.move]  # only this node can be considered
+        return node.value()
+
+    stack = [_SearchFrame(node, depth, alpha, beta, maximising_player)]
+    # the value and move list of the most recently finished child of the topmost frame
+    result: Optional[Tuple[int, List[Move]]] = None
+
+    while True:
+        frame = stack[-1]
+        cutoff = False
+
+        # a child has been searched completely; use its result as alpha_beta_search does after its recursive call
+        if result is not None:
+            _value, move_list = result
+            result = None
+            frame.child.take_back_move()  # take back (just making this call more visible)
+            if frame.maximising_player:
+                if _value > frame.value:
+                    frame.value = _value
+                if frame.value > frame.alpha:
+                    frame.alpha = frame.value
+                    frame.best_move_list = move_list
+            else:
+                if _value < frame.value:
+                    frame.value = _value
+                if frame.value < frame.beta:
+                    frame.beta = frame.value
+                    frame.best_move_list = move_list
+            # prune the search tree
+            cutoff = frame.alpha >= frame.beta
+
+        child = None if cutoff else next(frame.children, None)
+
+        # all children are searched (or pruned), hence the frame's result is passed to its parent
+        if child is None:
+            stack.pop()
+            # this is a leaf node
+            if frame.num_children == 0:
+                frame.value = frame.node.value()
+            # node.move is None indicates that this is the root node
+            if frame.node.move is not None:
+                frame.best_move_list.insert(0, frame.node.move)
+            if not stack:
+                if trace_moves:
+                    return frame.value, frame.best_move_list
+                return frame.value
+            result = frame.value, frame.best_move_list
+            continue
+
+        frame.num_children += 1
+        frame.child = child
+        child.make_move()  # make move (just making this call more visible)
+        child_depth = frame.depth - 1
+        if callback is not None:
+            callback(child, child_depth, frame.alpha, frame.beta, not frame.maximising_player)
+        if child_depth == 0:
+            # depth reached: the child's value is its result directly
+            result = child.value(), [child.move]
+        else:
+            stack.append(_SearchFrame(child, child_depth, frame.alpha, frame.beta, not frame.maximising_player))
+
+
+def _negascout(node: GameNode, depth: int, alpha: int, beta: int, colour: int,
+               callback: Optional[SearchCallbackFunction]) -> Tuple[int, List[Move]]:
+    """
+    Negamax formulation of the principal variation search. Values are seen from the perspective of the player to move,
+    that is, they are multiplied by `colour` (1 for the maximising and -1 for the minimising player).
+    :return: the value of the node from the perspective of the player to move, and the list of optimal moves
+    """
+    if callback is not None:
+        # the callback expects the window from the maximising player's perspective
+        if colour == 1:
+            callback(node, depth, alpha, beta, True)
+        else:
+            callback(node, depth, -beta, -alpha, False)
+
+    # recursion anchor: depth reached
+    if depth == 0:
+        return colour * node.value(), [] if node.move is None else [node.move]
+
+    num_children = 0
+    child_depth = depth - 1
+    value = -INFINITY
+    best_move_list = []
+
+    for child in node.children():
+        num_children += 1
+        child.make_move()  # make move (just making this call more visible)
+        if num_children == 1:
+            # the first child is expected to be the best one due to the move ordering, hence gets the full window
+            _value, move_list = _negascout(child, child_depth, -beta, -alpha, -colour, callback)
+            _value = -_value
+        else:
+            # the other children only need to be proven worse than the best child so far using a null window
+            _value, move_list = _negascout(child, child_depth, -alpha - 1, -alpha, -colour, callback)
+            _value = -_value
+            if alpha < _value < beta:
+                # this child is better; the full window is needed for the exact value and the optimal moves
+                _value, move_list = _negascout(child, child_depth, -beta, -alpha, -colour, callback)
+                _value = -_value
+        child.take_back_move()  # take back (just making this call more visible)
+        if _value > value:
+            value = _value
+        if value > alpha:
+            alpha = value
+            best_move_list = move_list
+        # prune the search tree
+        if alpha >= beta:
+            break
+
+    # this is a leaf node
+    if num_children == 0:
+        value = colour * node.value()
+
+    # node.move is None indicates that this is the root function call
+    if node.move is not None:
+        best_move_list.insert(0, node.move)
+
+    return value, best_move_list
+
+
+def principal_variation_search(node: GameNode, depth: int, alpha: int = -INFINITY, beta: int = INFINITY,
+                               maximising_player: bool = True,
+                               callback: Optional[SearchCallbackFunction] = None,
+                               trace_moves: bool = False) -> Union[int, Tuple[int, List[Move]]]:
+    """
+    Calculates the same game value as `alpha_beta_search` using the principal variation search (also known as
+    NegaScout). Only the first child of each node is searched with the full window, while the other children are
+    searched with a null window that merely proves them to be worse; they are searched again if that fails.
+    This needs less nodes than `alpha_beta_search` if the first child usually is the best one, which the move ordering
+    of `GameNode` aims at. The move list may differ from the one of `alpha_beta_search` if there are multiple optimal
+    move sequences.
+    :param node: a `Node` instance
+    :param depth: how many levels to search
+    :param alpha:
+    :param beta:
+    :param maximising_player: True by default
+    :param callback: callable that is called at the beginning of each function call
+    :param trace_moves: whether to return a list of the optimal moves; will be computed either way
+    :return: the value of the game until the current depth, and optionally a list of optimal moves
+    """
+    if maximising_player:
+        value, move_list = _negascout(node, depth, alpha, beta, 1, callback)
+    else:
+        value, move_list = _negascout(node, depth, -beta, -alpha, -1, callback)
+        value = -value
+
+    if trace_moves:
+        return value, move_list
+    return value
+
+
+def _search_root_child(args: Tuple[GameNode, int, bool]) -> Tuple[int, List[Move]]:
+    """
+    Searches the subtree of a single child of the root node. This is a module level function in order to be usable
+    by worker processes that receive their own copy of the child (and hence of the game field).
+    :param args: the child node, the remaining depth and whether the maximising player moves at the child
+    :return: the value of the child and the list of optimal moves starting with the child's move
+    """
+    child, depth, maximising_player = args
+    child.make_move()
+    value, move_list = alpha_beta_search(child, depth, maximising_player=maximising_player, trace_moves=True)
+    child.take_back_move()
+    return value, move_list
+
+
+def parallel_alpha_beta_search(node: GameNode, depth: int, maximising_player: bool = True,
+                               trace_moves: bool = False,
+                               max_workers: Optional[int] = None) -> Union[int, Tuple[int, List[Move]]]:
+    """
+    Calculates the same game value as `alpha_beta_search` but searches the subtrees of the root's children in
+    separate processes. As the children are searched independently, they can not share their alpha and beta values,
+    which results in less pruning than a sequential search. The move list may therefore differ from the one of
+    `alpha_beta_search` if there are multiple optimal move sequences.
+    :param node: a `GameNode` instance; it must be picklable
+    :param depth: how many levels to search
+    :param maximising_player: True by default
+    :param trace_moves: whether to return a list of the optimal moves; will be computed either way
+    :param max_workers: the number of worker processes; defaults to the number of processors
+    :return: the value of the game until the current depth, and optionally a list of optimal moves
+    """
+    children = list(node.children()) if depth > 0 else []
+
+    # this is a leaf node (or the depth is reached); there is nothing to parallelise, and the sequential search
+    # returns the same results for these nodes as for the children's leaves
+    if len(children) == 0:
+        return alpha_beta_search(node, depth, maximising_player=maximising_player, trace_moves=trace_moves)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(_search_root_child,
+                                    [(child, depth - 1, not maximising_player) for child in children]))
+
+    # take the first of the best children like the sequential search does
+    value, best_move_list = results[0]
+    for _value, move_list in results[1:]:
+        if (maximising_player and _value > value) or (not maximising_player and _value < value):
+            value, best_move_list = _value, move_list
+
+    # node.move is None indicates that this is the root of the whole game
+    if node.move is not None:
+        best_move_list.insert(0, node.move)
+
+    if trace_moves:
+        return value, best_move_list
+    return value
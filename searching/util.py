@@ -1,4 +1,6 @@
-from typing import Iterator, Tuple, Generator, Callable
+from functools import lru_cache
+from operator import itemgetter
+from typing import Iterator, Tuple, Generator, Callable, Optional, List, Dict
 
 from rulesets.Rulesets import BaseRuleSet
 from sanjego.gameobjects import GameField, Move
@@ -9,9 +11,10 @@ def kings_neighbourhood(pos: Tuple[int, int]) -> Generator[Tuple[int, int], None
     Given a position `pos` this function generates all positions in a king's neighbourhood around `pos`.
     :param pos: a position given by a tuple
     """
-    for to_pos in [(x, y) for x in [pos[0] - 1, pos[0], pos[0] + 1]
-                   for y in [pos[1] - 1, pos[1], pos[1] + 1]]:
-        yield to_pos
+    # nested loops over tuples yield the positions directly without building any lists first
+    for x in (pos[0] - 1, pos[0], pos[0] + 1):
+        for y in (pos[1] - 1, pos[1], pos[1] + 1):
+            yield x, y
 
 
 def quad_neighbourhood(pos: Tuple[int, int]) -> Generator[Tuple[int, int], None, None]:
@@ -25,17 +28,88 @@ def quad_neighbourhood(pos: Tuple[int, int]) -> Generator[Tuple[int, int], None,
     yield pos[0], pos[1] - 1
 
 
+@lru_cache(maxsize=None)
+def neighbour_table(neighbourhood: Callable[[Tuple[int, int]], Generator[Tuple[int, int], None, None]], height: int,
+                    width: int) -> Dict[Tuple[int, int], Tuple[Tuple[int, int], ...]]:
+    """
+    Computes the neighbourhood of every position on a board of the given size once, such that move generation does not
+    need to call the `neighbourhood` function for every position of every game state.
+    Positions outside the board and the position itself are left out as no rule set allows moves to them. Apart from
+    that, the neighbours are in the order the `neighbourhood` function yields them.
+    The tables are cached, hence must not be modified.
+    :param neighbourhood: function to determine neighbourhood of a position
+    :param height: number of rows of the board
+    :param width: number of columns of the board
+    :return: dict that maps each position on the board to the positions in its neighbourhood
+    """
+    return {(x, y): tuple(to_pos for to_pos in neighbourhood((x, y))
+                          if to_pos != (x, y) and 0 <= to_pos[0] < height and 0 <= to_pos[1] < width)
+            for x in range(height) for y in range(width)}
+
+
+def move_heuristic(game_field: GameField, move: Optional[Move], max_player: bool, value: Optional[int] = None) -> \
+        float:
+    """
+    Computes a heuristic value of the game state that arose from making `move` on `game_field`. It is used for sorting
+    the game states but does not necessarily represent the actual value of the underlying board.
+    This heuristic will make use of the `move` if it is not None to rate boards higher that arose from making a move in
+    the middle of the board.
+    :param game_field: the game field *after* making `move`; may be the one before if `value` is given
+    :param move: the move that led to this game state
+    :param max_player: whether the maximising player moves next
+    :param value: the value of the game field after making `move`; `game_field.value` is used if `None`
+    :return: heuristic value of the game state
+    """
+    if value is None:
+        value = game_field.value
+
+    # the basic idea is to lay more weight on moves that happen in the middle of the board,
+    # as they seem to be more important in terms of the outcome of the game
+
+    # heuristic does only apply to real moves
+    if move is not None and not move.is_skip_move():
+        x, y = move.from_pos
+        h = game_field.height
+        w = game_field.width
+
+        # bias values are high in the middle of the board and low at the border
+        # depend on the actual board size, hence are affecting even the end game due to high values
+        bias_x = h - abs(x - h / 2)
+        bias_y = w - abs(y - w / 2)
+
+        # normalized biases, which should only affect the opening but get nearly irrelevant in the end game
+        # difference in terms of nodes searched using these is narrow
+        # bias_x = 1 - abs(x - h / 2)/h
+        # bias_y = 1 - abs(y - w / 2)/w
+
+        # counter-intuitive logic because the MOVE that led to this node is rated as well:
+        # If it is max_player's turn to make the next move,
+        # it means that a move from min_player led to this state. Hence, the heuristic must be decreased in order to
+        # make this state more attractive for min_player.
+        if max_player:
+            return value - bias_x - bias_y
+        else:
+            return value + bias_x + bias_y
+    else:
+        return value
+
+
 class GameNode(object):
     """
     Represents a state of San Jego. It provides methods to iterate over all descending game states, and receive the
     value of this game state.
     """
 
+    __slots__ = ('skipped_before', 'game_field', 'move', 'rule_set_type', 'rule_set', 'max_player', 'neighbourhood',
+                 'neighbours', 'player')
+
     def __init__(self, game_field: GameField, rule_set_type: type(BaseRuleSet), move: Move = None,
                  max_player: bool = True,
                  skipped_before: bool = False,
                  neighbourhood: Callable[
-                     [Tuple[int, int]], Generator[Tuple[int, int], None, None]] = kings_neighbourhood) -> None:
+                     [Tuple[int, int]], Generator[Tuple[int, int], None, None]] = kings_neighbourhood,
+                 rule_set: Optional[BaseRuleSet] = None,
+                 neighbours: Optional[Dict[Tuple[int, int], Tuple[Tuple[int, int], ...]]] = None) -> None:
         """
         Creates a new `GameNode` by setting the game field, rule set and player given as arguments.
         If `player` is omitted, it is set to `game_field`'s `player1` attribute.
@@ -47,68 +121,95 @@ class GameNode(object):
         :param move: stores information on how this game node was derived from the previous one
         :param max_player: whether the maximising player moves next
         :param neighbourhood: function to determine neighbourhood of a position
+        :param rule_set: for internal use only; an existing `rule_set_type` instance on `game_field` to share
+        :param neighbours: for internal use only; the `neighbour_table` of `neighbourhood` for `game_field`
         """
         # both parameters can not be None, because it is not clear what RuleSet to use in that case
         self.skipped_before = skipped_before
         self.game_field = game_field
         self.move = move
         self.rule_set_type = rule_set_type
-        self.rule_set = rule_set_type(game_field)
+        # rule sets do not hold any state besides the game field, hence all descendants can share one instance
+        if rule_set is None:
+            rule_set = rule_set_type(game_field)
+        self.rule_set = rule_set
         self.max_player = max_player
         self.neighbourhood = neighbourhood
-        if self.max_player:
-            self.player = self.game_field.player1
-        else:
-            self.player = self.game_field.player2
-
-    def _children(self) -> Iterator[Tuple['GameNode', float]]:
-        """
-        Iterates over all possible/allowed following game states and returns those states along with their heuristics.
-        :return: iterator over all tuples of following game states and their heuristic values
-        """
-        count = 0
-        # iterate over any position on the field
-        # list() needed to copy all the field's positions; they are modified by making moves
-        for from_pos in list(self.game_field.field):
-
-            # iterate over the king's neighbourhood of from_pos...
-            for to_pos in self.neighbourhood(from_pos):
-                move = Move(from_pos, to_pos)
-
-                # ... and yield any allowed moves
-                if self.rule_set.allows_move(self.player, move=move):
-                    count += 1
-                    gn = GameNode(self.game_field, self.rule_set_type, move, not self.max_player,
-                                  skipped_before=False, neighbourhood=self.neighbourhood)
-                    gn.make_move()  # needs to be done here already to allow proper sorting
-                    heur_val = gn.heuristic_value()
-                    # Now the move must be taken back, because otherwise following iterations won't work.
-                    # This is inefficient as the move must be made again in the alpha_beta_search but it's still faster
-                    # than copying the board.
-                    gn.take_back_move()
-                    yield gn, heur_val
-
-        if count == 0 and not self.skipped_before:  # game ends if both players can not move
+        if neighbours is None:
+            neighbours = neighbour_table(neighbourhood, game_field.height, game_field.width)
+        self.neighbours = neighbours
+        self.player = game_field.player1 if max_player else game_field.player2
+
+    def _rated_moves(self) -> List[Tuple[float, Move]]:
+        """
+        Collects all possible/allowed moves from this game state along with the heuristic values of the game states
+        they lead to. No child nodes are created in order to allow the search to stop early without wasting work.
+        :return: list of tuples of heuristic values and the respective moves
+        """
+        # the rule set does not change during a search, so its check is looked up once per node; passing explicit
+        # positions skips the move object handling and only allowed moves need a Move instance at all
+        allows_move = self.rule_set.allows_move
+        player = self.player
+        neighbours = self.neighbours
+
+        # iterate over any position on the field and its (precomputed) neighbourhood and collect any allowed moves
+        # first; the field is not modified while doing so, hence there is no need to copy its positions
+        allowed_moves = [(from_pos, to_pos) for from_pos in self.game_field.field
+                         for to_pos in neighbours[from_pos] if allows_move(player, from_pos, to_pos)]
+
+        # the moves are rated by the value they would lead to, which the game field computes without making them
+        game_field = self.game_field
+        value = game_field.value
+        delta_value = game_field.delta_value
+        rated_moves = []
+        for from_pos, to_pos in allowed_moves:
+            move = Move(from_pos, to_pos)
+            heur_val = move_heuristic(game_field, move, not self.max_player, value + delta_value(from_pos, to_pos))
+            rated_moves.append((heur_val, move))
+
+        if len(allowed_moves) == 0 and not self.skipped_before:  # game ends if both players can not move
             # maybe the skipping move can be done implicitly like so:
             # for child in GameNode(gf, RuleSet(gf), not self.max_player, skipped_before=True).children():
             #    yield child
             # however, this could conflict with the alpha beta search (moving player)
-            gn = GameNode(self.game_field, self.rule_set_type, Move.skip(), not self.max_player, skipped_before=True,
-                          neighbourhood=self.neighbourhood)
-            heur_val = gn.heuristic_value()  # no need to actually make the move as it is a skip anyway
-            yield gn, heur_val
+            # no need to actually make the move as it is a skip anyway; the child shares this node's game field and
+            # as it is the only child, there is nothing to sort (skip moves are rated with the game value)
+            rated_moves.append((value, Move.skip()))
+
+        return rated_moves
 
-    def children(self) -> Iterator['GameNode']:
+    def children(self, first_move: Optional[Move] = None) -> Iterator['GameNode']:
         """
         Iterates over all possible/allowed following game states.
+        :param first_move: a move that is known to be good (e.g. from a previous search), hence is tried first
         :return: iterator over all following game states
         """
-        # _children returns (child, val)
-        if self.max_player:
-            return map(lambda x: x[0], sorted(self._children(), key=lambda x: x[1], reverse=True))  # high to low values
-        else:
-            return map(lambda x: x[0],
-                       sorted(self._children(), key=lambda x: x[1], reverse=False))  # low to high values
+        rated_moves = self._rated_moves()
+        # high to low values for the maximising player and low to high values for the minimising player;
+        # the sort is stable, hence moves with equal values keep the order they were generated in
+        rated_moves.sort(key=itemgetter(0), reverse=self.max_player)
+
+        if first_move is not None:
+            for i, (_, move) in enumerate(rated_moves):
+                if move == first_move:
+                    rated_moves.insert(0, rated_moves.pop(i))
+                    break
+
+        # children are only created when the search actually asks for them
+        for _, move in rated_moves:
+            yield GameNode(self.game_field, self.rule_set_type, move, not self.max_player,
+                           skipped_before=move.is_skip_move(), neighbourhood=self.neighbourhood,
+                           rule_set=self.rule_set, neighbours=self.neighbours)
+
+    def is_capture(self, move: Move) -> bool:
+        """
+        Returns whether making `move` would cover a tower of the opponent. This must be checked before the move is made.
+        :param move: a move of the player that moves at this node
+        :return: whether `move` is a capturing move
+        """
+        if move.is_skip_move():
+            return False
+        return self.game_field.get_tower_at(move.to_pos).owner != self.player
 
     def heuristic_value(self) -> float:
         """
@@ -117,35 +218,15 @@ class GameNode(object):
         This heuristic will make use of the `move` attribute if it is not None to rate boards higher that arose from
         making a move in the middle of the board.
         """
-        # the basic idea is to lay more weight on moves that happen in the middle of the board,
-        # as they seem to be more important in terms of the outcome of the game
-
-        # heuristic does only apply to real moves
-        if self.move is not None and not self.move.is_skip_move():
-            x, y = self.move.from_pos
-            h = self.game_field.height
-            w = self.game_field.width
-
-            # bias values are high in the middle of the board and low at the border
-            # depend on the actual board size, hence are affecting even the end game due to high values
-            bias_x = h - abs(x - h / 2)
-            bias_y = w - abs(y - w / 2)
-
-            # normalized biases, which should only affect the opening but get nearly irrelevant in the end game
-            # difference in terms of nodes searched using these is narrow
-            # bias_x = 1 - abs(x - h / 2)/h
-            # bias_y = 1 - abs(y - w / 2)/w
-
-            # counter-intuitive logic because the MOVE that led to this node is rated as well:
-            # If `self` is a position for max_player to make the move,
-            # it means that a move from min_player led to `self`. Hence, the heuristic must be decreased in order to
-            # make `self` more attractive for min_player.
-            if self.max_player:
-                return self.game_field.value - bias_x - bias_y
-            else:
-                return self.game_field.value + bias_x + bias_y
-        else:
-            return self.game_field.value
+        return move_heuristic(self.game_field, self.move, self.max_player)
+
+    def transposition_key(self) -> Tuple[int, bool, bool]:
+        """
+        Returns a key that identifies the game state of this node regardless of the moves that led to it. Besides the
+        towers on the field, the state consists of the player to move and whether the previous move was skipped.
+        :return: a hashable key for transposition tables
+        """
+        return self.game_field.zobrist_hash(), self.max_player, self.skipped_before
 
     def value(self) -> int:
         """
@@ -174,12 +255,23 @@ class GameNode(object):
         return f"turn of player {self.player}\n" + self.game_field.__str__()
 
 
+# any callable with this signature can be passed as callback to the search functions
+SearchCallbackFunction = Callable[[GameNode, int, int, int, bool], None]
+
+
 class SearchCallback(object):
     """
     This class serves as an abstract base class for every callback class that is suitable for the alpha beta search.
+    The search functions call callbacks directly, hence plain functions can be used as well.
     """
 
-    def callback(self, node: GameNode, depth: int, alpha: float, beta: float, maximising_player: bool) -> None:
+    def __call__(self, node: GameNode, depth: int, alpha: int, beta: int, maximising_player: bool) -> None:
+        """
+        Calls the `callback` method, which subclasses override.
+        """
+        self.callback(node, depth, alpha, beta, maximising_player)
+
+    def callback(self, node: GameNode, depth: int, alpha: int, beta: int, maximising_player: bool) -> None:
         """
         This method will be called once at the beginning of an alpha_beta_search invocation.
         """
@@ -197,8 +289,12 @@ class CountCallback(SearchCallback):
         """
         self.counter = 0
 
-    def callback(self, node: GameNode, depth: int, alpha: float, beta: float, maximising_player: bool) -> None:
+    def __call__(self, node: GameNode, depth: int, alpha: int, beta: int, maximising_player: bool) -> None:
         """
         Increases the internal counter by 1, ignoring all arguments to this method.
+        This overrides `SearchCallback.__call__` in order to count every searched node with a single call.
         """
         self.counter += 1
+
+    # kept for compatibility with code that calls the callback method directly
+    callback = __call__
@@ -1,9 +1,16 @@
+import ast
+import itertools
+import os
+import pickle
+import subprocess
+import sys
 import unittest
 from unittest import TestCase
 
 from sanjego.gameobjects import Tower, GameField, Move
 
-UNSAFE_MODE = False  # allows the execution of tests that contain eval expressions
+# making or taking back a skipping move does not change it, hence the tests can share one
+SKIP = Move.skip()
 
 
 class TestTower(TestCase):
@@ -12,16 +19,14 @@ class TestTower(TestCase):
         Trying to create a tower with conflicting arguments (owner != structure[0]) should raise an `ValueError` to
         help finding bugs.
         """
-        with self.assertRaises(ValueError):
-            Tower(1, [2])
-            Tower(1, [2, 1])
+        self.assertRaises(ValueError, Tower, 1, [2])
+        self.assertRaises(ValueError, Tower, 1, [2, 1])
 
     def test__init__no_args_raises_error(self) -> None:
         """
         Trying to create a tower without arguments should raise an `ValueError` because it it not clear what to do.
         """
-        with self.assertRaises(ValueError):
-            Tower()
+        self.assertRaises(ValueError, Tower)
 
     def test_can_omit_owner_in__init__(self) -> None:
         """
@@ -31,8 +36,8 @@ class TestTower(TestCase):
         tower = Tower(structure=structure)
         expected_owner = structure[0]
         actual_owner = tower.owner
-        self.assertEqual(expected_owner, actual_owner, f"owner should be derived from topmost brick if omitted in\
-                                                        constructor")
+        self.assertEqual(expected_owner, actual_owner,
+                         "owner should be derived from topmost brick if omitted in constructor")
 
     def test_height_of_unit_tower(self) -> None:
         """
@@ -41,7 +46,7 @@ class TestTower(TestCase):
         tower = Tower(structure=[])
         expected_height = 0
         actual_height = tower.height
-        self.assertEqual(expected_height, actual_height, f"height of unit tower should be 0 but is {actual_height}")
+        self.assertEqual(expected_height, actual_height, "height of unit tower should be 0")
 
     def test_height_of_empty_tower(self) -> None:
         """
@@ -79,29 +84,26 @@ class TestTower(TestCase):
         expected_height = 1
         actual_height = tower.height
         self.assertEqual(expected_height, actual_height,
-                         f"height of tower created by default constructor \
-                         should be {expected_height} but is {actual_height}")
+                         "height of tower created by default constructor should be 1")
 
         expected_brick = owner
         actual_brick = tower.structure[0]
         self.assertEqual(expected_brick, actual_brick,
-                         f"topmost brick of tower created by default constructor\
-                         should be equal to the owner ({expected_brick}) but is {actual_brick}")
+                         "topmost brick of tower created by default constructor should be equal to the owner")
 
     def test_owner_is_topmost_brick(self) -> None:
         """
         The owner of a tower should be equal to the topmost brick (even if that brick is changed later).
         """
         owner = 1
-        other_owner = 2
-        self.assertNotEqual(owner, other_owner, "misconfigured test: owners should be different")
+        other_owner = 2  # has to differ from owner
 
         tower = Tower(owner=owner)
         tower.structure[0] = other_owner
         expected_owner = other_owner
         actual_owner = tower.owner
         self.assertEqual(expected_owner, actual_owner,
-                         f"owner of tower ({actual_owner}) should be equal to the topmost brick ({other_owner})")
+                         "owner of tower should be equal to the topmost brick")
 
     def test_attaching(self) -> None:
         """
@@ -117,8 +119,7 @@ class TestTower(TestCase):
         lower_tower.attach(upper_tower)
 
         self.assertEqual(expected_structure, lower_tower.structure,
-                         f"after attaching {upper_tower} on top of {lower_tower},\
-                         the resulting tower should have the combined structure")
+                         "after attaching, the resulting tower should have the combined structure")
 
     def test_height_after_attaching(self) -> None:
         """
@@ -126,18 +127,23 @@ class TestTower(TestCase):
         """
         top_owner = 1
         lower_owner = 2
-        for top_structure in [None, [top_owner], [top_owner, lower_owner]]:
-            for lower_structure in [None, [lower_owner], [lower_owner, lower_owner]]:
-                with self.subTest():
-                    top_tower = Tower(owner=top_owner, structure=top_structure)
-                    lower_tower = Tower(owner=lower_owner, structure=lower_structure)
-
-                    expected_height = top_tower.height + lower_tower.height
-                    lower_tower.attach(top_tower)
-                    actual_height = lower_tower.height
-                    self.assertEqual(expected_height, actual_height,
-                                     f"stacked tower's height should be \
-                                     the sum of heights of initial towers ({expected_height}) but is {actual_height}")
+        # structures with their heights; without a structure, a tower only consists of its owner's brick
+        top_cases = [(None, 1), ([top_owner], 1), ([top_owner, lower_owner], 2)]
+        lower_cases = [(None, 1), ([lower_owner], 1), ([lower_owner, lower_owner], 2)]
+
+        # collect all heights first and compare them at once, which reports every wrong height in a single message
+        expected_heights = {}
+        actual_heights = {}
+        for (top_structure, top_height), (lower_structure, lower_height) in itertools.product(top_cases, lower_cases):
+            top_tower = Tower(owner=top_owner, structure=top_structure)
+            lower_tower = Tower(owner=lower_owner, structure=lower_structure)
+
+            case = f"{top_tower} on {lower_tower}"
+            expected_heights[case] = top_height + lower_height
+            lower_tower.attach(top_tower)
+            actual_heights[case] = lower_tower.height
+        self.assertEqual(expected_heights, actual_heights,
+                         "stacked tower's height should be the sum of heights of initial towers")
 
     def test_attach_None_raises_exception(self) -> None:
         """
@@ -156,11 +162,8 @@ class TestTower(TestCase):
         tower = Tower(1)
         empty_tower = Tower(2)
         empty_tower.structure = None
-        with self.assertRaises(ValueError, msg="attaching an empty tower should raise a ValueError"):
-            tower.attach(empty_tower)
-
-        with self.assertRaises(ValueError, msg="attaching a tower to an empty tower should raise a ValueError"):
-            empty_tower.attach(tower)
+        self.assertRaises(ValueError, tower.attach, empty_tower)  # attaching an empty tower
+        self.assertRaises(ValueError, empty_tower.attach, tower)  # attaching a tower to an empty tower
 
     def test_detach_topmost_brick(self) -> None:
         """
@@ -229,10 +232,10 @@ class TestTower(TestCase):
         Two towers should not be equal if they have a different structure.
         """
         tower1 = Tower(1)
-        for structure in [None, [2], [1, 2], [2, 1]]:
-            owner = structure[0] if structure is not None else 0
-            tower2 = Tower(owner=owner, structure=structure)
-            self.assertNotEqual(tower1, tower2, "both towers should not be considered equal")
+        other_towers = [Tower(owner=structure[0] if structure is not None else 0, structure=structure)
+                        for structure in [None, [2], [1, 2], [2, 1]]]
+        # membership is checked via Tower.__eq__, hence this asserts inequality to all other towers at once
+        self.assertNotIn(tower1, other_towers, "both towers should not be considered equal")
 
     def test__eq__with_None(self) -> None:
         """
@@ -241,14 +244,22 @@ class TestTower(TestCase):
         tower = Tower(1)
         self.assertNotEqual(tower, None, "a tower should not be equal to None")
 
-    @unittest.skipUnless(UNSAFE_MODE, "test__repr__ (unsafe test using eval())")
     def test__repr__(self) -> None:
         """
-        The evaluation of a tower's __repr__() method should be equal to that tower.
+        A tower's __repr__() should be a `Tower` constructor call whose structure argument is a literal equal to the
+        tower's structure.
         """
-        tower = Tower(1)
-        self.assertEqual(eval(tower.__repr__()), tower, "The evaluation of a tower's __repr__() method should be equal\
-                                                        to that tower.")
+        prefix = "Tower(structure="
+        suffix = ")"
+        for structure in [[1], [2, 1], [1, 1, 2], [], None]:
+            with self.subTest(f"structure {structure}"):
+                tower = Tower(1)
+                tower.structure = structure  # also covers empty towers, which can not be constructed directly
+                representation = repr(tower)
+                self.assertTrue(representation.startswith(prefix) and representation.endswith(suffix),
+                                "repr should be a constructor call with the structure as keyword argument")
+                actual_structure = ast.literal_eval(representation[len(prefix):-len(suffix)])
+                self.assertEqual(tower.structure, actual_structure)
 
 
 class MoveTest(TestCase):
@@ -316,40 +327,34 @@ class MoveTest(TestCase):
 
 
 class TestGameField(TestCase):
+    # shared by tests that only store it on a field without making moves, i.e. without changing it
+    _UNIT_TOWER_P1 = Tower(owner=1)
+
     def test_default__init__(self) -> None:
         """
         The `GameField` constructor should set the field's height and width correctly.
         """
-        for expected_height in range(-10, 11):
-            for expected_width in range(-10, 11):
-                with self.subTest(f"height {expected_height} and width {expected_width}"):
-                    gf = GameField(height=expected_height, width=expected_width)
-                    actual_height = gf.height
-                    actual_width = gf.width
-                    self.assertEqual(expected_height, actual_height,
-                                     f"expected given height ({expected_height}) after constructor call\
-                                     but got {actual_height}")
-                    self.assertEqual(expected_width, actual_width,
-                                     f"expected given width ({expected_width}) after constructor call\
-                                     but got {actual_width}")
+        # storing the sizes does not depend on their magnitude, hence boundary values and some typical ones suffice
+        expected_sizes = [(-10, -10), (-10, 0), (0, -10), (-1, -1), (0, 0), (1, 1), (2, 3), (10, 10), (10, -10)]
+        actual_sizes = []
+        for expected_height, expected_width in expected_sizes:
+            gf = GameField(height=expected_height, width=expected_width)
+            actual_sizes.append((gf.height, gf.width))
+        self.assertListEqual(expected_sizes, actual_sizes, "expected given height and width after constructor call")
 
     def test_players_at__init__(self) -> None:
         """
         The `GameField` constructor should set the field's players correctly.
         """
         # make sure to include positive, negative and neutral numbers
-        for expected_player1 in range(-1, 2):
-            for expected_player2 in [p for p in range(-1, 2) if p != expected_player1]:
-                with self.subTest(f"max. player {expected_player1} and min. player {expected_player2}"):
-                    gf = GameField(height=2, width=2, player1=expected_player1, player2=expected_player2)
-                    actual_player1 = gf.player1
-                    actual_player2 = gf.player2
-                    self.assertEqual(expected_player1, actual_player1,
-                                     f"expected given player1 ({expected_player1}) after constructor call\
-                                     but got {actual_player1}")
-                    self.assertEqual(expected_player2, actual_player2,
-                                     f"expected given player2 ({expected_player2}) after constructor call\
-                                 but got {actual_player2}")
+        expected_players = [(player1, player2) for player1 in range(-1, 2) for player2 in range(-1, 2)
+                            if player1 != player2]
+        actual_players = []
+        for expected_player1, expected_player2 in expected_players:
+            gf = GameField(height=2, width=2, player1=expected_player1, player2=expected_player2)
+            actual_players.append((gf.player1, gf.player2))
+        self.assertEqual(expected_players, actual_players,
+                         "expected given (player1, player2) after constructor call")
 
     def test_players_at__init__are_equal(self) -> None:
         """
@@ -357,8 +362,7 @@ class TestGameField(TestCase):
         """
         player_id = 1
         some_size = (2, 2)  # does not play a role for this test
-        with self.assertRaises(ValueError):
-            GameField(*some_size, player1=player_id, player2=player_id)
+        self.assertRaises(ValueError, GameField, *some_size, player1=player_id, player2=player_id)
 
     def test_players_on_field(self) -> None:
         """
@@ -369,34 +373,23 @@ class TestGameField(TestCase):
             for expected_player2 in [p for p in range(-1, 2) if p != expected_player1]:
                 with self.subTest(f"players {expected_player1} and {expected_player2}"):
                     gf = GameField(height=2, width=2, player1=expected_player1, player2=expected_player2)
-
-                    # check whether the intended players have towers on the board
                     # TODO avoid accessing gf.field directly
-                    self.assertTrue(expected_player1 in map(lambda x: x.owner, gf.field.values()),
-                                    f"player {expected_player1} should be on the board")
-                    self.assertTrue(expected_player2 in map(lambda x: x.owner, gf.field.values()),
-                                    f"player {expected_player2} should be on the board")
-
-                    # check whether there are towers with other owners than the given players on the board
-                    additional_players_on_board = [p for p in map(lambda x: x.owner, gf.field.values()) if
-                                                   p != expected_player1 and p != expected_player2]
-                    self.assertEqual([], additional_players_on_board,
-                                     f"there should be no more players on the board than {expected_player1} and\
-                                    {expected_player2} but found {additional_players_on_board}")
+                    owners = {tower.owner for tower in gf.field.values()}
+
+                    # both intended players should have towers on the board, and there should be no other owners
+                    self.assertSetEqual({expected_player1, expected_player2}, owners,
+                                        "expected only the given players on the board")
 
     def test_value_after_construction(self) -> None:
         """
         Right after creation, a game field's value should be 0 to make the game fair.
         """
-        expected_value = 0
-        for height in range(1, 10):
-            for width in range(1, 10):
-                if not height * width == 1:  # if there's only one tower, the game value is not 0
-                    with self.subTest(f"height {height} and {width}"):
-                        gf = GameField(height=height, width=width)
-                        actual_value = gf.value
-                        self.assertEqual(expected_value, actual_value,
-                                         "the value of a GameField should be 0 after creation")
+        # representative sizes: a single row or column, small boards with an odd or even number of towers, a big board
+        sizes = [(height, width) for height, width in itertools.product([1, 2, 3, 9], repeat=2)
+                 if not height * width == 1]  # if there's only one tower, the game value is not 0
+        expected_values = {size: 0 for size in sizes}
+        actual_values = {size: GameField(*size).value for size in sizes}
+        self.assertDictEqual(expected_values, actual_values, "the value of a GameField should be 0 after creation")
 
     def test_value_after_construction_with_one_tower(self) -> None:
         """
@@ -410,16 +403,14 @@ class TestGameField(TestCase):
                 gf.set_tower_at(pos=(0, 0), tower=Tower(structure=[gf.player1] * tower_height))
                 expected_value = tower_height
                 actual_value = gf.value
-                self.assertEqual(expected_value, actual_value, f"one tower with height {expected_value} owned by max\
-                                 player should give a game value of {expected_value} but is {actual_value}")
+                self.assertEqual(expected_value, actual_value, "one tower of max player should give its height")
 
             # minimising player
             with self.subTest(f"height {tower_height} for min"):
                 gf.set_tower_at(pos=(0, 0), tower=Tower(structure=[gf.player2] * tower_height))
                 expected_value = -1 * tower_height
                 actual_value = gf.value
-                self.assertEqual(expected_value, actual_value, f"one tower with height {expected_value} owned by min\
-                                 player should give a game value of {expected_value} but is {actual_value}")
+                self.assertEqual(expected_value, actual_value, "one tower of min player should give -height")
 
     def test_value_after_first_move(self) -> None:
         """
@@ -429,10 +420,7 @@ class TestGameField(TestCase):
         """
 
         height = 2
-        width = 3
-
-        self.assertTrue(height * width > 2,
-                        f"misconfigured test: height*width should be greater than 2 but is {height}*{width} <= 2")
+        width = 3  # height * width has to be greater than 2 (non-trivial field)
 
         with self.subTest("move for max (1st) player"):
             gf = GameField(height=height, width=width)
@@ -460,8 +448,7 @@ class TestGameField(TestCase):
         gf.set_tower_at(pos, expected_tower)
         actual_tower = gf.get_tower_at(pos)
         self.assertEqual(expected_tower, actual_tower,
-                         f"Setting a tower to a location and getting one from there right after setting should return\
-                         the same tower")
+                         "getting a tower right after setting it should return the same tower")
 
     def test_get_tower_at_invalid_positions(self) -> None:
         """
@@ -470,15 +457,12 @@ class TestGameField(TestCase):
         """
         height = 5
         width = 4
-        for x in [-1, 0, height]:
-            for y in [-1, 0, width]:
-                if not (x == 0 and y == 0):  # this is a valid position
-                    with self.subTest(f"pos = ({x}, {y})"):
-                        expected_tower = None
-                        gf = GameField(height=height, width=width)
-                        actual_tower = gf.get_tower_at((x, y))
-                        self.assertEqual(expected_tower, actual_tower,
-                                         "Getting a tower from an invalid position should return None")
+        gf = GameField(height, width)
+        positions = [(x, y) for x in [-1, 0, height] for y in [-1, 0, width]
+                     if not (x == 0 and y == 0)]  # (0, 0) is a valid position
+        actual_towers = {pos: gf.get_tower_at(pos) for pos in positions}
+        self.assertDictEqual({pos: None for pos in positions}, actual_towers,
+                             "Getting a tower from an invalid position should return None")
 
     def test_set_tower_at_valid_positions(self) -> None:
         """
@@ -486,15 +470,15 @@ class TestGameField(TestCase):
         """
         height = 5
         width = 4
-        some_tower = Tower(owner=1)  # not relevant for this test
+        some_tower = self._UNIT_TOWER_P1  # not relevant for this test
 
-        # these for loops cover the edge cases and the one in the middle
-        for x in [0, height // 2, height - 1]:
-            for y in [0, height // 2, width - 1]:
-                with self.subTest(f"pos = ({x}, {y})"):
-                    gf = GameField(height=height, width=width)
-                    self.assertTrue(gf.set_tower_at(pos=(x, y), tower=some_tower),
-                                    "Setting a tower to a valid position should return True")
+        # setting a tower at a valid position does not affect setting one at another position, hence one field suffices
+        gf = GameField(height=height, width=width)
+        # these positions cover the edge cases and the one in the middle
+        positions = list(itertools.product([0, height // 2, height - 1], [0, width // 2, width - 1]))
+        results = {pos: gf.set_tower_at(pos=pos, tower=some_tower) for pos in positions}
+        self.assertDictEqual({pos: True for pos in positions}, results,
+                             "Setting a tower to a valid position should return True")
 
     def test_set_tower_at_invalid_positions(self) -> None:
         """
@@ -502,16 +486,15 @@ class TestGameField(TestCase):
         """
         height = 5
         width = 4
-        some_tower = Tower(owner=1)  # not relevant for this test
+        some_tower = self._UNIT_TOWER_P1  # not relevant for this test
+        gf = GameField(height, width)
 
-        # these loops test positions that are just one off as well as positions that are far off
-        for x in [-5, -1, 0, height]:
-            for y in [-1, 0, width]:
-                if not (x == 0 and y == 0):  # this is a valid position
-                    with self.subTest(f"pos = ({x}, {y})"):
-                        gf = GameField(height=height, width=width)
-                        self.assertFalse(gf.set_tower_at(pos=(x, y), tower=some_tower),
-                                         "Setting a tower to an invalid position should return False")
+        # these positions are just one off as well as far off
+        positions = [(x, y) for x in [-5, -1, 0, height] for y in [-1, 0, width]
+                     if not (x == 0 and y == 0)]  # (0, 0) is a valid position
+        results = {pos: gf.set_tower_at(pos=pos, tower=some_tower) for pos in positions}
+        self.assertDictEqual({pos: False for pos in positions}, results,
+                             "Setting a tower to an invalid position should return False")
 
     def test_make_move_with_explicit_positions(self) -> None:
         """
@@ -547,7 +530,7 @@ class TestGameField(TestCase):
         gf = GameField(1, 2)
         expected_gf = GameField(1, 2)
 
-        move = Move.skip()
+        move = SKIP
 
         gf.make_move(move=move)
         self.assertEqual(expected_gf.get_tower_at(from_pos), gf.get_tower_at(from_pos),
@@ -561,22 +544,30 @@ class TestGameField(TestCase):
         Making a skip move should return true, indicating success.
         """
         gf = GameField(1, 2)
-        self.assertTrue(gf.make_move(move=Move.skip()), "Making a skip move should return true, indicating success")
+        self.assertTrue(gf.make_move(move=SKIP), "Making a skip move should return true, indicating success")
 
-    def test_make_move_to_and_from_invalid_positions(self) -> None:
+    def test_make_move_invalid_positions_smoke(self) -> None:
+        """
+        Making an invalid move should communicate that this operation was not successful.
+        This test only covers some typical cases; see `test_make_move_invalid_positions_full` for all combinations.
+        """
+        gf = GameField(5, 4)
+        for from_pos, to_pos in [((-1, -1), (0, 0)), ((0, 0), (5, 0)), ((5, 0), (5, 0)), ((0, 4), (0, 0))]:
+            with self.subTest(f"{from_pos} -> {to_pos}"):
+                self.assertFalse(gf.make_move(from_pos, to_pos), "Making an invalid move should return False")
+
+    def test_make_move_invalid_positions_full(self) -> None:
         """
         Making an invalid move should communicate that this operation was not successful.
         """
         height = 5
         width = 4
         positions = [(x, y) for x in [-1, 0, height] for y in [-1, 0, width] if not (x == 0 and y == 0)]
-        for from_pos in positions:
-            for to_pos in positions:
-                with self.subTest(f"{from_pos} -> {to_pos}"):
-                    gf = GameField(height=height, width=width)
-
-                    successful: bool = gf.make_move(from_pos, to_pos)
-                    self.assertFalse(successful, "Making an invalid move should return False")
+        gf = GameField(height, width)
+        results = {}
+        for from_pos, to_pos in itertools.product(positions, repeat=2):
+            results[f"{from_pos} -> {to_pos}"] = gf.make_move(from_pos, to_pos)
+        self.assertEqual({move: False for move in results}, results, "Making an invalid move should return False")
 
     def test_make_move_inplace(self) -> None:
         """
@@ -610,14 +601,12 @@ class TestGameField(TestCase):
         # check source position
         tower_at_from_pos = gf.get_tower_at(from_pos)
         self.assertTrue(tower_at_from_pos is None or tower_at_from_pos.height == 0,
-                        f"the source position {from_pos} should contain an empty or unit tower after move\
-                        but found {tower_at_from_pos}")
+                        "the source position should contain an empty or unit tower after move")
 
         # check target position
         expected_tower = Tower(structure=[player1, player2])
         actual_tower = gf.get_tower_at(to_pos)
-        self.assertEqual(expected_tower, actual_tower, f"Expected combined tower ({expected_tower}) at {to_pos} after\
-                         move but found {actual_tower}")
+        self.assertEqual(expected_tower, actual_tower, "expected combined tower at to_pos after move")
 
     def test_moves_towers_correctly_with_move_object(self) -> None:
         """
@@ -643,14 +632,12 @@ class TestGameField(TestCase):
         # check source position
         tower_at_from_pos = gf.get_tower_at(from_pos)
         self.assertTrue(tower_at_from_pos is None or tower_at_from_pos.height == 0,
-                        f"the source position {from_pos} should contain an empty or unit tower after move\
-                        but found {tower_at_from_pos}")
+                        "the source position should contain an empty or unit tower after move")
 
         # check target position
         expected_tower = Tower(structure=[player1, player2])
         actual_tower = gf.get_tower_at(to_pos)
-        self.assertEqual(expected_tower, actual_tower, f"Expected combined tower ({expected_tower}) at {to_pos} after\
-                         move but found {actual_tower}")
+        self.assertEqual(expected_tower, actual_tower, "expected combined tower at to_pos after move")
 
     def test_move_without_position_data_raises_error(self) -> None:
         """
@@ -812,7 +799,7 @@ class TestGameField(TestCase):
         gf = GameField(1, 2)
         expected_gf = GameField(1, 2)
 
-        move = Move.skip()
+        move = SKIP
 
         gf.take_back(move=move)
         self.assertEqual(expected_gf.get_tower_at(from_pos), gf.get_tower_at(from_pos),
@@ -833,6 +820,140 @@ class TestGameField(TestCase):
         game_field.take_back(move)
         self.assertEqual(prev_game_field.get_tower_at(from_pos), game_field.get_tower_at(from_pos))
         self.assertEqual(prev_game_field.get_tower_at(to_pos), game_field.get_tower_at(to_pos))
+        self.assertEqual(prev_game_field.value, game_field.value, "taking back a move should restore the value")
+
+    def test_value_after_covering_highest_tower(self) -> None:
+        """
+        The value should be correct after a move covers the highest tower of a player, and after taking it back.
+        """
+        player1 = 0
+        player2 = 1
+        # [0] | [1, 1] | [1]
+        gf = GameField.setup_field({
+            (0, 0): Tower(owner=player1),
+            (0, 1): Tower(structure=[player2] * 2),
+            (0, 2): Tower(owner=player2)
+        })
+        self.assertEqual(-1, gf.value, "misconfigured test: player 2's highest tower should be higher by 1")
+
+        move = Move((0, 0), (0, 1))
+        gf.make_move(move=move)
+        # [0, 1, 1] | [1]
+        self.assertEqual(2, gf.value, "the value should be based on the remaining highest tower of player 2")
+
+        gf.take_back(move)
+        self.assertEqual(-1, gf.value, "taking back a move should restore the previous value")
+
+    def test_value_after_covering_one_of_several_highest_towers(self) -> None:
+        """
+        The value should be correct after a move covers one of several highest towers of a player, and after taking it
+        back.
+        """
+        player1 = 0
+        player2 = 1
+        # [0] | [1, 1] | [1, 1]
+        gf = GameField.setup_field({
+            (0, 0): Tower(owner=player1),
+            (0, 1): Tower(structure=[player2] * 2),
+            (0, 2): Tower(structure=[player2] * 2)
+        })
+        self.assertEqual(-1, gf.value, "misconfigured test: player 2's highest towers should be higher by 1")
+
+        move = Move((0, 0), (0, 1))
+        gf.make_move(move=move)
+        # [0, 1, 1] | [1, 1]
+        self.assertEqual(1, gf.value, "the value should be based on the other highest tower of player 2")
+
+        gf.take_back(move)
+        self.assertEqual(-1, gf.value, "taking back a move should restore the previous value")
+
+    def test_delta_value(self) -> None:
+        """
+        The delta value of a move should be the change of the value that making the move causes, and computing it
+        should not change the game field.
+        """
+        player1 = 0
+        player2 = 1
+        # [0] | [1, 1] | [1]
+        # [1] | [0]    | [0, 0, 1]
+        gf = GameField.setup_field({
+            (0, 0): Tower(owner=player1),
+            (0, 1): Tower(structure=[player2] * 2),
+            (0, 2): Tower(owner=player2),
+            (1, 0): Tower(owner=player2),
+            (1, 1): Tower(owner=player1),
+            (1, 2): Tower(structure=[player1] * 2 + [player2])
+        })
+        prev_gf = GameField.setup_field({pos: Tower(structure=list(tower.structure))
+                                         for pos, tower in gf.field.items()})
+        for from_pos in list(gf.field):
+            for to_pos in list(gf.field):
+                if from_pos == to_pos:
+                    continue
+                with self.subTest(f"{from_pos} -> {to_pos}"):
+                    value = gf.value
+                    delta_value = gf.delta_value(from_pos, to_pos)
+                    self.assertEqual(prev_gf, gf, "computing the delta value should not change the game field")
+                    move = Move(from_pos, to_pos)
+                    gf.make_move(move=move)
+                    self.assertEqual(gf.value - value, delta_value, "wrong delta value")
+                    gf.take_back(move)
+
+    def test_hash_after_construction(self) -> None:
+        """
+        The hash of a newly created game field should be the same as the one of an equal game field that is set up
+        tower by tower.
+        """
+        for height, width in [(1, 1), (2, 3), (4, 4)]:
+            with self.subTest(f"height {height} and width {width}"):
+                gf = GameField(height, width)
+                equal_gf = GameField.setup_field({pos: Tower(structure=list(tower.structure))
+                                                  for pos, tower in gf.field.items()}, height, width)
+                self.assertEqual(hash(equal_gf), hash(gf), "equal game fields should have the same hash")
+
+    def test_hash_after_moves(self) -> None:
+        """
+        The hash of a game field should be the same as the one of an equal, newly created game field after making moves
+        and after taking them back.
+        """
+        gf = GameField(2, 3)
+        initial_hash = hash(gf)
+        moves = [Move((0, 0), (0, 1)), Move((1, 1), (0, 1)), Move((1, 2), (0, 2)), Move((0, 1), (0, 2))]
+        for move in moves:
+            with self.subTest(f"after {move}"):
+                self.assertTrue(gf.make_move(move=move), "misconfigured test: move is not possible")
+                equal_gf = GameField.setup_field({pos: Tower(structure=list(tower.structure))
+                                                  for pos, tower in gf.field.items()}, gf.height, gf.width)
+                self.assertEqual(equal_gf, gf, "misconfigured test: game fields should be equal")
+                self.assertEqual(hash(equal_gf), hash(gf), "equal game fields should have the same hash")
+        for move in reversed(moves):
+            gf.take_back(move)
+        self.assertEqual(initial_hash, hash(gf), "taking back all moves should restore the hash")
+
+    def test_hash_in_other_process(self) -> None:
+        """
+        A game field that was pickled in another process should be equal to and have the same hash as an equal game
+        field of this process, as search functions send game fields to worker processes.
+        """
+        moves = [Move((1, 1), (0, 1)), Move((1, 2), (0, 2))]
+        script = "import pickle, sys\n" \
+                 "from sanjego.gameobjects import GameField, Move\n" \
+                 "GameField(4, 4)  # the other process uses the game fields in a different order\n" \
+                 "gf = GameField(2, 3)\n" \
+                 f"for move in {moves!r}:\n" \
+                 "    gf.make_move(move=move)\n" \
+                 "sys.stdout.buffer.write(pickle.dumps(gf))\n"
+        root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        pickled_gf = subprocess.run([sys.executable, "-c", script], cwd=root_dir, check=True,
+                                    stdout=subprocess.PIPE).stdout
+        other_gf = pickle.loads(pickled_gf)
+
+        gf = GameField(2, 3)
+        for move in moves:
+            gf.make_move(move=move)
+        self.assertEqual(gf, other_gf, "game fields from other processes should be equal")
+        self.assertEqual(hash(gf), hash(other_gf), "game fields from other processes should have the same hash")
+        self.assertEqual(other_gf._compute_zobrist(), hash(other_gf), "the hash should be valid in this process")
 
     def test__eq__(self) -> None:
         """
@@ -862,14 +983,24 @@ class TestGameField(TestCase):
         })
         self.assertNotEqual(gf1, gf2, "both game fields should not be considered equal")
 
+    def test__eq__after_move(self) -> None:
+        """
+        A game field should differ from an equal one after making a move and be equal again after taking it back.
+        """
+        gf1 = GameField(2, 3)
+        gf2 = GameField(2, 3)
+        move = Move((0, 0), (0, 1))
+        gf1.make_move(move=move)
+        self.assertNotEqual(gf1, gf2, "game fields should differ after a move on only one of them")
+        gf1.take_back(move)
+        self.assertEqual(gf1, gf2, "game fields should be equal after taking back the move")
 
-if __name__ == "__main__":
-    import sys
+    def test__eq__with_None(self) -> None:
+        """
+        A game field should not be equal to None.
+        """
+        self.assertNotEqual(GameField(1, 2), None, "a game field should not be equal to None")
 
-    while "unsafe" in sys.argv:
-        UNSAFE_MODE = True
-        sys.argv.remove("unsafe")
-    if UNSAFE_MODE:
-        print("Warning: Running in UNSAFE_MODE. eval() expressions may be executed")
 
+if __name__ == "__main__":
     unittest.main()
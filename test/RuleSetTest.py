@@ -1,3 +1,4 @@
+import itertools
 from unittest import TestCase
 
 from sanjego.gameobjects import GameField, Tower, Move
@@ -26,23 +27,22 @@ class TestBaseRuleSet(TestCase):
         height = 5
         width = 4
         positions = [(x, y) for x in [-1, 0, height] for y in [-1, 0, width] if not (x == 0 and y == 0)]
-        for from_pos in positions:
-            for to_pos in positions:
-                for RuleSet in [BaseRuleSet, KingsRuleSet, MajorityRuleSet, FreeRuleSet, MoveOnOpposingOnlyRuleSet]:
-                    with self.subTest(f"{from_pos} -> {to_pos} in {RuleSet.__name__}"):
-                        gf = GameField(height=height, width=width)
-                        rs = RuleSet(gf)
-                        self.assertFalse(rs.allows_move(gf.player1, from_pos, to_pos),
-                                         f"player {gf.player1} should not be able to move from {from_pos} -> {to_pos}")
-                        self.assertFalse(rs.allows_move(gf.player2, from_pos, to_pos),
-                                         f"player {gf.player2} should not be able to move from {from_pos} -> {to_pos}")
+        gf = GameField(height=height, width=width)  # not changed by the rule sets
+        results = {}
+        for RuleSet in [BaseRuleSet, KingsRuleSet, MajorityRuleSet, FreeRuleSet, MoveOnOpposingOnlyRuleSet]:
+            rs = RuleSet(gf)
+            for player in [gf.player1, gf.player2]:
+                for from_pos, to_pos in itertools.product(positions, repeat=2):
+                    results[f"player {player}: {from_pos} -> {to_pos} in {RuleSet.__name__}"] = \
+                        rs.allows_move(player, from_pos, to_pos)
+        self.assertEqual({case: False for case in results}, results,
+                         "players should not be able to move from or to outside the field")
 
     def test_does_not_allow_moving_without_towers(self) -> None:
         """
         The rule set should not allow moving from or to positions where no tower is.
         This should be consistent with the `set_tower_at` method.
         """
-        from itertools import combinations
         no_tower_pos1 = (1, 1)
         no_tower_pos2 = (1, 2)
         tower_pos = (0, 1)
@@ -56,15 +56,14 @@ class TestBaseRuleSet(TestCase):
 
         for RuleSet in [BaseRuleSet, KingsRuleSet, MajorityRuleSet, FreeRuleSet, MoveOnOpposingOnlyRuleSet]:
             rs = RuleSet(gf)
-            for (from_pos, to_pos) in combinations(positions, 2):
+            # moves are directional, hence both moving from and moving to a position without tower are tested
+            for (from_pos, to_pos) in itertools.permutations(positions, 2):
                 with self.subTest(f"explicit: {from_pos} -> {to_pos} in {RuleSet.__name__}"):
-                    self.assertNotEqual(from_pos, tower_pos, "misconfigured test: both positions must not be equal")
                     self.assertFalse(rs.allows_move(player1, from_pos, to_pos),
-                                     f"should not allow move from {from_pos} -> {to_pos} (missing tower)")
+                                     "should not allow this move (missing tower)")
                 with self.subTest(f"move: {from_pos} -> {to_pos} in {RuleSet.__name__}"):
-                    self.assertNotEqual(from_pos, tower_pos, "misconfigured test: both positions must not be equal")
                     self.assertFalse(rs.allows_move(player1, move=Move(from_pos, to_pos)),
-                                     f"should not allow move from {from_pos} -> {to_pos} (missing tower)")
+                                     "should not allow this move (missing tower)")
 
     def test_does_not_allow_diagonal_move(self) -> None:
         """
@@ -84,10 +83,10 @@ class TestBaseRuleSet(TestCase):
             for to_pos in positions:
                 with self.subTest(f"explicit: {from_pos} -> {to_pos} in {RuleSet.__name__}"):
                     self.assertFalse(rs.allows_move(some_player, from_pos, to_pos),
-                                     f"should not allow move {from_pos} -> {to_pos}")
+                                     "should not allow this move (diagonal)")
                 with self.subTest(f"move: {from_pos} -> {to_pos} in {RuleSet.__name__}"):
                     self.assertFalse(rs.allows_move(some_player, move=Move(from_pos, to_pos)),
-                                     f"should not allow move {from_pos} -> {to_pos}")
+                                     "should not allow this move (diagonal)")
 
     def test_does_not_allow_moving_opposing_towers(self) -> None:
         """
@@ -133,14 +132,14 @@ class TestBaseRuleSet(TestCase):
             rs = RuleSet(gf)
             with self.subTest(f"explicit: {RuleSet.__name__}"):
                 self.assertTrue(rs.allows_move(player1, from_pos, to_pos),
-                                f"player {player1} should be able to move tower {subject_tower}")
+                                "the first player should be able to move the tower")
                 self.assertFalse(rs.allows_move(some_other_player, from_pos, to_pos),
-                                 f"player {some_other_player} should not be able to move tower {subject_tower}")
+                                 "the other player should not be able to move the tower")
             with self.subTest(f"move: {RuleSet.__name__}"):
                 self.assertTrue(rs.allows_move(player1, move=Move(from_pos, to_pos)),
-                                f"player {player1} should be able to move tower {subject_tower}")
+                                "the first player should be able to move the tower")
                 self.assertFalse(rs.allows_move(some_other_player, move=Move(from_pos, to_pos)),
-                                 f"player {some_other_player} should not be able to move tower {subject_tower}")
+                                 "the other player should not be able to move the tower")
 
     def test_player_may_move_tower_with_half_share(self) -> None:
         """
@@ -153,23 +152,25 @@ class TestBaseRuleSet(TestCase):
         player2 = 2
         self.assertNotEqual(player1, player2, "misconfigured test: both player IDs should be different")
 
-        # multiple tests with shuffled structure
-        for structure in permutations([player1] * 2 + [player2] * 2):
+        # the tower at from_pos is replaced for every structure, hence one field and rule set suffice
+        gf = GameField(1, 2, player1=player1, player2=player2)
+        rs = MajorityRuleSet(gf)
+
+        # multiple tests with shuffled structure; permutations of repeated bricks contain duplicates, which are skipped
+        for structure in sorted(set(permutations([player1] * 2 + [player2] * 2))):
             tower = Tower(structure=structure)
             with self.subTest(f"test tower {tower}"):
-                gf = GameField(1, 2, player1=player1, player2=player2)
                 gf.set_tower_at(from_pos, tower)
-                rs = MajorityRuleSet(gf)
 
                 # makes sure the tower at to_pos is an opposing tower
                 gf.set_tower_at(to_pos, Tower(owner=player2))
                 self.assertTrue(rs.allows_move(player1, from_pos, to_pos),
-                                f"player {player1} should be able to move the tower {tower}")
+                                "the first player should be able to move the tower")
 
                 # makes sure the tower at to_pos is an opposing tower
                 gf.set_tower_at(to_pos, Tower(owner=player2))
                 self.assertTrue(rs.allows_move(player2, from_pos, to_pos),
-                                f"player {player2} should be able to move the tower {tower}")
+                                "the second player should be able to move the tower")
 
     def test_player_may_move_tower_with_majority(self) -> None:
         """
@@ -183,7 +184,7 @@ class TestBaseRuleSet(TestCase):
         self.assertNotEqual(player1, some_other_player, "misconfigured test: both player IDs should be different")
 
         # multiple tests with shuffled structure while a clear majority of player1 is maintained
-        for structure in permutations([player1] * 2 + [some_other_player]):
+        for structure in sorted(set(permutations([player1] * 2 + [some_other_player]))):
             tower = Tower(structure=structure)
             gf = GameField.setup_field({
                 from_pos: tower,
@@ -192,14 +193,14 @@ class TestBaseRuleSet(TestCase):
             rs = MajorityRuleSet(gf)
             with self.subTest(f"explicit: test tower {tower}"):
                 self.assertTrue(rs.allows_move(player1, from_pos, to_pos),
-                                f"player {player1} should be able to move the tower {tower}")
+                                "the first player should be able to move the tower")
                 self.assertFalse(rs.allows_move(some_other_player, from_pos, to_pos),
-                                 f"player {some_other_player} should not be able to move the tower {tower}")
+                                 "the other player should not be able to move the tower")
             with self.subTest(f"move: test tower {tower}"):
                 self.assertTrue(rs.allows_move(player1, move=Move(from_pos, to_pos)),
-                                f"player {player1} should be able to move the tower {tower}")
+                                "the first player should be able to move the tower")
                 self.assertFalse(rs.allows_move(some_other_player, move=Move(from_pos, to_pos)),
-                                 f"player {some_other_player} should not be able to move the tower {tower}")
+                                 "the other player should not be able to move the tower")
 
     def test_does_not_allow_move_with_same_owners(self) -> None:
         """
@@ -227,20 +228,20 @@ class TestBaseRuleSet(TestCase):
         """
         from_pos = (2, 2)
         positions = [(x, y) for x in [0, 2, 4] for y in [0, 2, 4, 5, 6]]
+        # all positions are too far from from_pos (or equal to it), hence a single field with all towers set suffices
+        gf = GameField(5, 7)
+        player1 = gf.player1
+        for pos in [from_pos] + positions:
+            gf.set_tower_at(pos=pos, tower=Tower(owner=player1))
         for RuleSet in [BaseRuleSet, KingsRuleSet, MajorityRuleSet, MoveOnOpposingOnlyRuleSet]:
+            rs = RuleSet(gf)
             for to_pos in positions:
-                gf = GameField(5, 7)
-                player1 = gf.player1
-                gf.set_tower_at(pos=from_pos, tower=Tower(owner=player1))
-                gf.set_tower_at(pos=to_pos, tower=Tower(owner=player1))
-
-                rs = RuleSet(gf)
                 with self.subTest(f"explicit: {from_pos} -> {to_pos} in {RuleSet.__name__}"):
                     self.assertFalse(rs.allows_move(player1, from_pos, to_pos),
-                                     f"should not allow move from {from_pos} -> {to_pos} (too far)")
+                                     "should not allow this move (too far)")
                 with self.subTest(f"move: {from_pos} -> {to_pos} in {RuleSet.__name__}"):
                     self.assertFalse(rs.allows_move(player1, move=Move(from_pos, to_pos)),
-                                     f"should not allow move from {from_pos} -> {to_pos} (too far)")
+                                     "should not allow this move (too far)")
 
     def test_does_not_allow_moving_for_wrong_player(self) -> None:
         """
@@ -250,19 +251,21 @@ class TestBaseRuleSet(TestCase):
         from_pos = (1, 1)
         # all fields around from_pos
         positions = [(x, y) for x in [0, 1, 2] for y in [0, 1, 2] if not (x, y) == from_pos]
+        # the rule set does not change the field, hence all target towers can be set up at once
+        gf = GameField(3, 3)
+        player1 = gf.player1
+        player2 = gf.player2
+        gf.set_tower_at(pos=from_pos, tower=Tower(structure=[player1, player2, player2]))  # p1 cannot move
         for to_pos in positions:
-            gf = GameField(3, 3)
-            player1 = gf.player1
-            player2 = gf.player2
-            gf.set_tower_at(pos=from_pos, tower=Tower(structure=[player1, player2, player2]))  # p1 cannot move
             gf.set_tower_at(pos=to_pos, tower=Tower(owner=player2))
-            rs = MajorityRuleSet(gf)
+        rs = MajorityRuleSet(gf)
+        for to_pos in positions:
             with self.subTest(f"explicit: {from_pos} -> {to_pos}"):
                 self.assertFalse(rs.allows_move(player1, from_pos, to_pos),
-                                 f"should not allow move from {from_pos} -> {to_pos} (player may not move tower)")
+                                 "should not allow this move (player may not move tower)")
             with self.subTest(f"move: {from_pos} -> {to_pos}"):
                 self.assertFalse(rs.allows_move(player1, move=Move(from_pos, to_pos)),
-                                 f"should not allow move from {from_pos} -> {to_pos} (player may not move tower)")
+                                 "should not allow this move (player may not move tower)")
 
     def test_move_with_missing_position_data_raises_error(self) -> None:
         """
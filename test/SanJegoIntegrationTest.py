@@ -1,10 +1,15 @@
 import unittest
+from typing import Callable, List, Optional, Tuple
 
 import pytest
 
 from sanjego.gameobjects import Tower, Move
 from searching import gamefabric
-from searching.methods import alpha_beta_search
+from searching.methods import alpha_beta_search, parallel_alpha_beta_search, principal_variation_search, \
+    iterative_alpha_beta_search, iterative_deepening, quiescence_search
+
+# the expected move lists only compare moves, hence they can share one skipping move
+SKIP = Move.skip()
 
 
 class TestSanJego(unittest.TestCase):
@@ -155,6 +160,161 @@ class TestSanJego(unittest.TestCase):
         self.assertEqual(expected_value, actual_value,
                          f"expected a game value of {expected_value} but got {actual_value}")
 
+    def test_quiescence_search(self) -> None:
+        """
+        The quiescence search should take captures into account but not other moves.
+        """
+        player1 = 0
+        player2 = 1
+
+        # [0] | [1]: each player can capture the other one's tower
+        game_field_specs = {
+            (0, 0): Tower(owner=player1),
+            (0, 1): Tower(owner=player2)
+        }
+        expected_values = (-2, 2)  # (min starts, max starts)
+        for maximising_player in [True, False]:
+            with self.subTest(f"capture as {('min', 'max')[maximising_player]}"):
+                gf, node = gamefabric.fabricate("base", 1, 2, maximising_player, game_field_specs)
+                actual_value = quiescence_search(node, maximising_player=maximising_player)
+                self.assertEqual(expected_values[maximising_player], actual_value, "the capture should be made")
+                self.assertEqual(0, gf.value, "the game field should be restored")
+            with self.subTest(f"capture as {('min', 'max')[maximising_player]} without depth"):
+                _, node = gamefabric.fabricate("base", 1, 2, maximising_player, game_field_specs)
+                actual_value = quiescence_search(node, maximising_player=maximising_player, depth=0)
+                self.assertEqual(0, actual_value, "no capture should be made without depth")
+
+        # [0] | [0] |     | [1]: player1 can only move onto its own tower, which is not a capture
+        game_field_specs[(0, 1)] = Tower(owner=player1)
+        game_field_specs[(0, 3)] = Tower(owner=player2)
+        with self.subTest("no capture"):
+            gf, node = gamefabric.fabricate("base", 1, 4, True, game_field_specs)
+            self.assertEqual(node.value(), quiescence_search(node), "only captures should be searched")
+
+    def test_alpha_beta_search_with_quiescence(self) -> None:
+        """
+        The alpha beta search should evaluate the nodes at its depth with the quiescence search if asked to, which
+        finds the game value of an exchange of captures that the search itself does not reach.
+        """
+        player1 = 0
+        player2 = 1
+
+        # [0] | [1]: the player to move captures the other one's tower, which ends the game
+        game_field_specs = {
+            (0, 0): Tower(owner=player1),
+            (0, 1): Tower(owner=player2)
+        }
+        for maximising_player in [True, False]:
+            with self.subTest(f"{('min', 'max')[maximising_player]}"):
+                _, node = gamefabric.fabricate("base", 1, 2, maximising_player, game_field_specs)
+                expected_value = alpha_beta_search(node, depth=3, maximising_player=maximising_player)
+                self.assertNotEqual(expected_value, alpha_beta_search(node, depth=0,
+                                                                      maximising_player=maximising_player),
+                                    "the search without quiescence should not see the capture")
+                actual_value, move_list = alpha_beta_search(node, depth=0, maximising_player=maximising_player,
+                                                            trace_moves=True, quiescence=True)
+                self.assertEqual(expected_value, actual_value, "the capture should be taken into account")
+                self.assertEqual([node.move], move_list, "the captures should not be traced")
+
+    def _assert_same_as_alpha_beta_search(self, search: Callable[..., Tuple[int, List[Move]]],
+                                          depths: Optional[List[int]] = None, same_moves: bool = False) -> None:
+        """
+        Searches 2x3 game fields of all rule sets for both players with `search` and asserts that it results in the
+        same game value as `alpha_beta_search` and that the traced moves lead to it.
+        :param search: the search function; called with a node, the depth, `maximising_player` and `trace_moves=True`
+        :param depths: the depths to search; the whole game by default
+        :param same_moves: whether the traced moves should equal the ones of `alpha_beta_search` as well
+        """
+        height = 2
+        width = 3
+        if depths is None:
+            depths = [2 * height * width + 1]
+        for rules in ["base", "kings", "oppose", "majority", "free"]:
+            for maximising_player in [True, False]:
+                for depth in depths:
+                    with self.subTest(f"{rules} as {('min', 'max')[maximising_player]} at depth {depth}"):
+                        # the order of generated moves depends on the history of the game field, hence both searches
+                        # need fresh ones
+                        _, node = gamefabric.fabricate(rules, height, width, maximising_player)
+                        expected_value, expected_move_list = alpha_beta_search(node, depth,
+                                                                               maximising_player=maximising_player,
+                                                                               trace_moves=True)
+                        gf, node = gamefabric.fabricate(rules, height, width, maximising_player)
+                        actual_value, move_list = search(node, depth, maximising_player=maximising_player,
+                                                         trace_moves=True)
+                        self.assertEqual(expected_value, actual_value, "wrongly calculated game value")
+                        if same_moves:
+                            self.assertEqual(expected_move_list, move_list, "the optimal moves differ")
+                        for move in move_list:
+                            self.assertTrue(gf.make_move(move=move), f"traced move {move} is not possible")
+                        self.assertEqual(expected_value, gf.value, "the traced moves should lead to the game value")
+
+    def test_parallel_search(self) -> None:
+        """
+        Searching the root's children in parallel should result in the same game value as the sequential search, and
+        the traced moves should lead to it.
+        """
+        self._assert_same_as_alpha_beta_search(parallel_alpha_beta_search)
+
+    def test_parallel_search_without_children(self) -> None:
+        """
+        The parallel search should return the same game value and moves as the sequential search if there is nothing
+        to search in parallel, i.e. at depth 0 or at the end of the game.
+        """
+        for height, width, depth in [(2, 2, 0), (1, 1, 0), (1, 1, 3)]:
+            for maximising_player in [True, False]:
+                with self.subTest(f"{height}x{width} at depth {depth} as {('min', 'max')[maximising_player]}"):
+                    _, node = gamefabric.fabricate("base", height, width, maximising_player)
+                    if height * width == 1:
+                        # the only child skips, after which the game ends
+                        node = next(node.children())
+                        maximising_player = not maximising_player
+                    expected = alpha_beta_search(node, depth=depth, maximising_player=maximising_player,
+                                                 trace_moves=True)
+                    actual = parallel_alpha_beta_search(node, depth=depth, maximising_player=maximising_player,
+                                                        trace_moves=True)
+                    self.assertEqual(expected, actual, "game value or optimal moves differ")
+
+    def test_transposition_table(self) -> None:
+        """
+        Using a transposition table should not alter the game value, and the traced moves should lead to it.
+        """
+        self._assert_same_as_alpha_beta_search(
+            lambda node, depth, **kwargs: alpha_beta_search(node, depth, transposition_table={}, **kwargs))
+
+    def test_principal_variation_search(self) -> None:
+        """
+        The principal variation search should result in the same game value as the alpha beta search, and the traced
+        moves should lead to it.
+        """
+        self._assert_same_as_alpha_beta_search(principal_variation_search)
+
+    def test_iterative_search(self) -> None:
+        """
+        The iterative alpha beta search should result in the same game value and moves as the recursive one.
+        """
+        self._assert_same_as_alpha_beta_search(iterative_alpha_beta_search, depths=[1, 4, 2 * 2 * 3 + 1],
+                                               same_moves=True)
+
+    def test_iterative_deepening(self) -> None:
+        """
+        Iterative deepening should result in the same game value as the alpha beta search, and the traced moves should
+        lead to it.
+        """
+        self._assert_same_as_alpha_beta_search(iterative_deepening)
+
+    def test_iterative_deepening_depth_0(self) -> None:
+        """
+        Iterative deepening with a maximum depth of 0 should behave like the alpha beta search with depth 0.
+        """
+        for maximising_player in [True, False]:
+            with self.subTest(f"{('min', 'max')[maximising_player]}"):
+                _, node = gamefabric.fabricate("base", 2, 2, maximising_player)
+                expected = alpha_beta_search(node, depth=0, maximising_player=maximising_player, trace_moves=True)
+                actual = iterative_deepening(node, max_depth=0, maximising_player=maximising_player,
+                                             trace_moves=True)
+                self.assertEqual(expected, actual, "game value or optimal moves differ")
+
 
 class TestMoveLists(unittest.TestCase):
     """
@@ -173,7 +333,7 @@ class TestMoveLists(unittest.TestCase):
         max_player_starts = True
 
         expected_move_list = [Move((1, 1), (0, 1)), Move((1, 0), (0, 0)),
-                              Move((0, 1), (0, 0)), Move.skip()]
+                              Move((0, 1), (0, 0)), SKIP]
         expected_value = 4
 
         game_field, start_node = gamefabric.fabricate("base", height, width, max_player_starts)
@@ -198,7 +358,7 @@ class TestMoveLists(unittest.TestCase):
 
         expected_move_list = [Move((1, 1), (0, 1)), Move((1, 2), (0, 2)),
                               Move((0, 1), (0, 2)), Move((1, 0), (0, 0)),
-                              Move.skip()]
+                              SKIP]
         expected_value = 2
 
         game_field, start_node = gamefabric.fabricate("base", height, width, max_player_starts)
@@ -228,12 +388,12 @@ class TestMoveLists(unittest.TestCase):
                                Move((1, 3), (0, 3)), Move((0, 1), (0, 0)),
                                Move((1, 2), (0, 2)), Move((2, 2), (2, 3)),
                                Move((0, 2), (0, 3)), Move((1, 0), (0, 0)),
-                               Move.skip()],
+                               SKIP],
                               [Move((1, 1), (1, 2)), Move((2, 3), (1, 3)),
                                Move((0, 0), (0, 1)), Move((2, 1), (2, 2)),
                                Move((1, 2), (0, 2)), Move((0, 3), (1, 3)),
                                Move((0, 2), (0, 1)), Move((1, 0), (2, 0)),
-                               Move.skip()]]
+                               SKIP]]
         expected_value = 2
 
         game_field, start_node = gamefabric.fabricate("base", height, width, max_player_starts)
@@ -257,7 +417,7 @@ class TestMoveLists(unittest.TestCase):
         max_player_starts = True
 
         expected_move_list = [Move((1, 1), (0, 1)), Move((1, 0), (0, 0)),
-                              Move((0, 1), (0, 0)), Move.skip()]
+                              Move((0, 1), (0, 0)), SKIP]
         expected_value = 4
 
         game_field, start_node = gamefabric.fabricate("oppose", height, width, max_player_starts)
@@ -282,7 +442,7 @@ class TestMoveLists(unittest.TestCase):
 
         expected_move_list = [Move((1, 1), (0, 1)), Move((1, 2), (0, 2)),
                               Move((0, 1), (0, 2)), Move((1, 0), (0, 0)),
-                              Move.skip()]
+                              SKIP]
         expected_value = 2
 
         game_field, start_node = gamefabric.fabricate("oppose", height, width, max_player_starts)
@@ -308,10 +468,10 @@ class TestMoveLists(unittest.TestCase):
 
         expected_move_list = [[Move((1, 1), (0, 1)), Move((1, 2), (0, 2)),
                                Move((2, 2), (2, 1)), Move((1, 0), (0, 0)),
-                               Move((0, 1), (0, 0)), Move.skip()],
+                               Move((0, 1), (0, 0)), SKIP],
                               [Move((1, 1), (2, 1)), Move((1, 2), (2, 2)),
                                Move((0, 2), (0, 1)), Move((1, 0), (2, 0)),
-                               Move((2, 1), (2, 2)), Move.skip()]]
+                               Move((2, 1), (2, 2)), SKIP]]
         expected_value = 2
 
         game_field, start_node = gamefabric.fabricate("oppose", height, width, max_player_starts)
@@ -337,11 +497,11 @@ class TestMoveLists(unittest.TestCase):
 
         expected_move_list = [[Move((2, 2), (2, 1)), Move((0, 1), (0, 2)),
                                Move((1, 1), (1, 0)), Move((1, 2), (1, 3)),
-                               Move.skip()],
+                               SKIP],
                               [Move((2, 2), (2, 1)), Move((0, 3), (0, 2)),
                                Move((1, 1), (0, 1)), Move((1, 0), (2, 0)),
                                Move((1, 3), (1, 2)), Move((0, 2), (1, 2)),
-                               Move((2, 1), (2, 0)), Move.skip()]]
+                               Move((2, 1), (2, 0)), SKIP]]
         expected_value = 0
 
         game_field, start_node = gamefabric.fabricate("oppose", height, width, max_player_starts)
@@ -365,7 +525,7 @@ class TestMoveLists(unittest.TestCase):
         max_player_starts = True
 
         expected_move_list = [Move((1, 1), (0, 1)), Move((1, 0), (0, 1)),
-                              Move((0, 0), (0, 1)), Move.skip()]
+                              Move((0, 0), (0, 1)), SKIP]
         expected_value = 4
 
         game_field, start_node = gamefabric.fabricate("kings", height, width, max_player_starts)
@@ -391,7 +551,7 @@ class TestMoveLists(unittest.TestCase):
 
         expected_move_list = [Move((1, 1), (0, 1)), Move((1, 2), (0, 1)),
                               Move((0, 2), (0, 1)), Move((1, 0), (0, 1)),
-                              Move((0, 0), (0, 1)), Move.skip()]
+                              Move((0, 0), (0, 1)), SKIP]
         expected_value = 6
 
         game_field, start_node = gamefabric.fabricate("kings", height, width, max_player_starts)
@@ -420,7 +580,7 @@ class TestMoveLists(unittest.TestCase):
         expected_move_list = [Move((2, 2), (1, 2)), Move((0, 1), (1, 1)),
                               Move((0, 2), (1, 1)), Move((2, 1), (2, 0)),
                               Move((1, 1), (1, 0)), Move((2, 0), (1, 0)),
-                              Move((0, 0), (1, 0)), Move.skip()]
+                              Move((0, 0), (1, 0)), SKIP]
         expected_value = 7
 
         game_field, start_node = gamefabric.fabricate("kings", height, width, max_player_starts)
@@ -443,9 +603,9 @@ class TestMoveLists(unittest.TestCase):
         max_player_starts = True
 
         expected_move_list = [[Move((1, 1), (0, 1)), Move((0, 0), (0, 1)),
-                               Move.skip()],
+                               SKIP],
                               [Move((1, 1), (0, 1)), Move((0, 0), (1, 0)),
-                               Move.skip()]]
+                               SKIP]]
         expected_value = 2
 
         game_field, start_node = gamefabric.fabricate("free", height, width, max_player_starts)
@@ -470,7 +630,7 @@ class TestMoveLists(unittest.TestCase):
 
         expected_move_list = [Move((1, 1), (0, 1)), Move((1, 2), (0, 2)),
                               Move((0, 1), (0, 2)), Move((1, 0), (0, 0)),
-                              Move.skip()]
+                              SKIP]
         expected_value = 2
 
         game_field, start_node = gamefabric.fabricate("free", height, width, max_player_starts)
@@ -499,14 +659,14 @@ class TestMoveLists(unittest.TestCase):
         expected_move_list = [[Move((1, 1), (0, 1)), Move((1, 2), (2, 2)),
                                Move((0, 0), (0, 1)), Move((2, 1), (2, 2)),
                                Move((0, 1), (0, 2)), Move((1, 0), (2, 0)),
-                               Move.skip()],
+                               SKIP],
                               [Move((1, 1), (0, 1)), Move((1, 2), (2, 2)),
                                Move((1, 0), (0, 0)), Move((2, 1), (2, 2)),
-                               Move((0, 1), (0, 0)), Move.skip()],
+                               Move((0, 1), (0, 0)), SKIP],
                               [Move((1, 1), (2, 1)), Move((1, 2), (0, 2)),
                                Move((2, 0), (2, 1)), Move((0, 1), (0, 2)),
                                Move((2, 1), (2, 2)), Move((1, 0), (0, 0)),
-                               Move.skip()]]
+                               SKIP]]
         expected_value = 1
 
         game_field, start_node = gamefabric.fabricate("free", height, width, max_player_starts)
@@ -530,7 +690,7 @@ class TestMoveLists(unittest.TestCase):
         max_player_starts = True
 
         expected_move_list = [Move((1, 1), (0, 1)), Move((1, 0), (0, 0)),
-                              Move((0, 1), (0, 0)), Move.skip()]
+                              Move((0, 1), (0, 0)), SKIP]
         expected_value = 4
 
         game_field, start_node = gamefabric.fabricate("majority", height, width, max_player_starts)
@@ -555,7 +715,7 @@ class TestMoveLists(unittest.TestCase):
 
         expected_move_list = [Move((1, 1), (0, 1)), Move((1, 2), (0, 2)),
                               Move((0, 1), (0, 2)), Move((1, 0), (0, 0)),
-                              Move.skip()]
+                              SKIP]
         expected_value = 2
 
         game_field, start_node = gamefabric.fabricate("majority", height, width, max_player_starts)
@@ -583,14 +743,14 @@ class TestMoveLists(unittest.TestCase):
         expected_move_list = [[Move((1, 1), (0, 1)), Move((1, 2), (2, 2)),
                                Move((2, 0), (1, 0)), Move((0, 1), (0, 2)),
                                Move((1, 0), (0, 0)), Move((2, 1), (2, 2)),
-                               Move.skip()],
+                               SKIP],
                               [Move((1, 1), (2, 1)),
                                Move((1, 2), (0, 2)),
                                Move((0, 0), (1, 0)),
                                Move((2, 1), (2, 2)),
                                Move((2, 0), (1, 0)),
                                Move((0, 1), (0, 2)),
-                               Move.skip()]]
+                               SKIP]]
         expected_value = 0
 
         game_field, start_node = gamefabric.fabricate("majority", height, width, max_player_starts)
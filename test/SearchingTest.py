@@ -1,9 +1,9 @@
 import unittest
 
-from searching.methods import alpha_beta_search
-from sanjego.gameobjects import Tower, GameField
+from searching.methods import alpha_beta_search, principal_variation_search, iterative_alpha_beta_search
+from sanjego.gameobjects import Tower, GameField, Move
 from rulesets.Rulesets import BaseRuleSet
-from searching.util import GameNode
+from searching.util import GameNode, neighbour_table, kings_neighbourhood, quad_neighbourhood, CountCallback
 
 
 class BinaryNode:
@@ -69,6 +69,54 @@ class AlphaBetaSearchTestCases(unittest.TestCase):
     def test_max_chooses_better_action_at_depth_3(self):
         self.assertEqual(alpha_beta_search(BinaryNode(1), depth=3), 13)
 
+    def test_calls_plain_function_as_callback(self):
+        calls = []
+        count_callback = CountCallback()
+        alpha_beta_search(BinaryNode(1), depth=3, callback=lambda *args: calls.append(args))
+        alpha_beta_search(BinaryNode(1), depth=3, callback=count_callback)
+        self.assertEqual(count_callback.counter, len(calls))
+        self.assertEqual((3, True), (calls[0][1], calls[0][4]), "the root should be passed first")
+
+    def test_count_callback_counts_calls_of_callback_method(self):
+        count_callback = CountCallback()
+        count_callback(BinaryNode(1), 0, 0, 0, True)
+        count_callback.callback(BinaryNode(1), 0, 0, 0, True)
+        self.assertEqual(2, count_callback.counter)
+
+
+class PrincipalVariationSearchTestCases(unittest.TestCase):
+    def test_max_returns_root_node_at_depth_0(self):
+        self.assertEqual(principal_variation_search(BinaryNode(1), depth=0), 1)
+
+    def test_max_returns_higher_of_two_children(self):
+        self.assertEqual(principal_variation_search(BinaryNode(1), depth=1), 3)
+
+    def test_min_returns_lower_of_two_children(self):
+        self.assertEqual(principal_variation_search(BinaryNode(1), depth=1, maximising_player=False), 2)
+
+    def test_min_chooses_better_action_at_depth_2(self):
+        self.assertEqual(principal_variation_search(BinaryNode(1), depth=2), 6)
+
+    def test_max_chooses_better_action_at_depth_3(self):
+        self.assertEqual(principal_variation_search(BinaryNode(1), depth=3), 13)
+
+
+class IterativeAlphaBetaSearchTestCases(unittest.TestCase):
+    def test_max_returns_root_node_at_depth_0(self):
+        self.assertEqual(iterative_alpha_beta_search(BinaryNode(1), depth=0), 1)
+
+    def test_max_returns_higher_of_two_children(self):
+        self.assertEqual(iterative_alpha_beta_search(BinaryNode(1), depth=1), 3)
+
+    def test_min_returns_lower_of_two_children(self):
+        self.assertEqual(iterative_alpha_beta_search(BinaryNode(1), depth=1, maximising_player=False), 2)
+
+    def test_min_chooses_better_action_at_depth_2(self):
+        self.assertEqual(iterative_alpha_beta_search(BinaryNode(1), depth=2), 6)
+
+    def test_max_chooses_better_action_at_depth_3(self):
+        self.assertEqual(iterative_alpha_beta_search(BinaryNode(1), depth=3), 13)
+
 
 class TestGameNode(unittest.TestCase):
     def test_children_of_1x1_field(self) -> None:
@@ -243,6 +291,80 @@ class TestGameNode(unittest.TestCase):
 
         pass
 
+    def test_children_share_rule_set(self) -> None:
+        """
+        Rule sets only depend on the game field, hence children should reuse the rule set of their parent.
+        """
+        gf = GameField(2, 2)
+        node = GameNode(gf, BaseRuleSet)
+        for child in node.children():
+            self.assertIs(node.rule_set, child.rule_set, "child should share the rule set of its parent")
+
+    def test_children_start_with_first_move(self) -> None:
+        """
+        A move that is passed as first move should be the move of the first child, while the other children remain.
+        """
+        gf = GameField(2, 3)
+        node = GameNode(gf, BaseRuleSet)
+        moves = [child.move for child in node.children()]
+        first_move = moves[-1]
+        moves_with_first_move = [child.move for child in node.children(first_move)]
+        self.assertEqual(first_move, moves_with_first_move[0], "the given move should come first")
+        self.assertEqual([first_move] + moves[:-1], moves_with_first_move, "the other moves should keep their order")
+
+    def test_children_order(self) -> None:
+        """
+        Children should be ordered by their heuristic values, with ties in the order the moves are generated in, that
+        is, the order of the positions on the field and their neighbourhoods. Rating the moves must not change it.
+        """
+        expected_moves = {
+            True: [Move((1, 1), (0, 1)), Move((1, 1), (1, 0)), Move((1, 1), (1, 2)), Move((0, 2), (0, 1)),
+                   Move((0, 2), (1, 2)), Move((0, 0), (0, 1)), Move((0, 0), (1, 0))],
+            False: [Move((1, 2), (0, 2)), Move((1, 2), (1, 1)), Move((0, 1), (0, 0)), Move((0, 1), (0, 2)),
+                    Move((0, 1), (1, 1)), Move((1, 0), (0, 0)), Move((1, 0), (1, 1))]
+        }
+        for is_max_player in [True, False]:
+            with self.subTest(f"as {('min', 'max')[is_max_player]} player"):
+                node = GameNode(GameField(2, 3), BaseRuleSet, max_player=is_max_player)
+                self.assertEqual(expected_moves[is_max_player], [child.move for child in node.children()],
+                                 "children are not in the expected order")
+                self.assertEqual(expected_moves[is_max_player], [child.move for child in node.children()],
+                                 "generating the children should not change their order")
+
+    def test_children_share_neighbours(self) -> None:
+        """
+        The neighbourhoods only depend on the size of the game field, hence children should reuse the ones of their
+        parent.
+        """
+        gf = GameField(2, 2)
+        node = GameNode(gf, BaseRuleSet)
+        for child in node.children():
+            self.assertIs(node.neighbours, child.neighbours, "child should share the neighbourhoods of its parent")
+
+
+class TestNeighbourTable(unittest.TestCase):
+    def test_only_contains_positions_on_board(self) -> None:
+        """
+        The precomputed neighbourhoods should not contain positions outside the board or the position itself.
+        """
+        for neighbourhood in [kings_neighbourhood, quad_neighbourhood]:
+            with self.subTest(neighbourhood.__name__):
+                table = neighbour_table(neighbourhood, 2, 3)
+                self.assertEqual(set((x, y) for x in range(2) for y in range(3)), set(table.keys()))
+                for pos, neighbours in table.items():
+                    for to_pos in neighbours:
+                        self.assertTrue(0 <= to_pos[0] < 2 and 0 <= to_pos[1] < 3, f"{to_pos} is not on the board")
+                        self.assertNotEqual(pos, to_pos, "a position should not be its own neighbour")
+
+    def test_keeps_order_of_neighbourhood(self) -> None:
+        """
+        The precomputed neighbourhoods should keep the order of the neighbourhood function, as it determines the order
+        of equally rated moves.
+        """
+        table = neighbour_table(quad_neighbourhood, 3, 3)
+        self.assertEqual(((2, 1), (0, 1), (1, 2), (1, 0)), table[(1, 1)])
+        self.assertEqual(((1, 0), (0, 1)), table[(0, 0)])
+
 
 if __name__ == '__main__':
     unittest.main()